@@ -3,28 +3,32 @@
 import sys
 from functools import partial
 from pathlib import Path
-from queue import Queue
-from threading import Thread
+from queue import Empty, SimpleQueue
+from threading import Event, Thread
 
 from another6502.cpu import CPU6502, run
 from another6502.memory import MemoryBlock, MemoryMap
 from another6502.peripherals import TerminalPeripheral, monitor_stdin
 
 
-def interrupt_hook(cpu: CPU6502, input_queue: Queue[bytes | None], terminal: TerminalPeripheral) -> None:
-    """Interrupt hook to handle terminal input."""
-    if input_queue.qsize() > 0:
-        ch = input_queue.get()
-        if ch is None:
-            sys.exit(0)
-        terminal.receive_input(ch[0])
-        cpu.irq()
+def interrupt_hook(cpu: CPU6502, input_queue: SimpleQueue[bytes | None], terminal: TerminalPeripheral) -> None:
+    """Interrupt hook to handle terminal input and print the buffered output."""
+    terminal.flush()
+    try:
+        ch = input_queue.get_nowait()
+    except Empty:
+        return
+    if ch is None:
+        sys.exit(0)
+    terminal.receive_input(ch[0])
+    cpu.irq()
 
 
 def main() -> None:  # noqa: D103
     # monitor incoming keystrokes and store them in a queue
-    input_queue: Queue[bytes | None] = Queue()
-    Thread(target=monitor_stdin, args=(input_queue,)).start()
+    input_queue: SimpleQueue[bytes | None] = SimpleQueue()
+    input_event = Event()
+    Thread(target=monitor_stdin, args=(input_queue, input_event)).start()
     terminal = TerminalPeripheral()
 
     # issue interrupts to the CPU when new inputs are in the queue
@@ -32,10 +36,7 @@ def main() -> None:  # noqa: D103
 
     ram = MemoryBlock(0xD000)
     rom = MemoryBlock(0x2000)
-    with (Path(__file__).parent / "6502_code/bin/echo.bin").open("rb") as f:
-        rom_contents = f.read()
-    for i, b in enumerate(rom_contents):
-        rom.write(i, b)
+    rom.write_bytes(0, (Path(__file__).parent / "6502_code/bin/echo.bin").read_bytes())
     memory_map = (MemoryMap()
         .add_block(0x0000, ram)
         .add_block(0xD000, terminal.mmio_block)
@@ -43,7 +44,7 @@ def main() -> None:  # noqa: D103
     cpu = CPU6502(memory_map)
     start_address = (memory_map.read(0xFFFD) << 8) | memory_map.read(0xFFFC)
     cpu.pc = start_address
-    run(cpu, interrupt_hook=interrupt_hook_with_queue, max_steps=None, cycles_per_second=1000)
+    run(cpu, interrupt_hook=interrupt_hook_with_queue, max_steps=None, wakeup=input_event, cycles_per_second=1000)
 
 
 if __name__ == "__main__":
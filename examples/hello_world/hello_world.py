@@ -57,3 +57,4 @@ if __name__ == "__main__":
 
     cpu = CPU6502(system_memory)
     run(cpu)
+    terminal.flush()
@@ -0,0 +1,808 @@
+"""Compilation of basic blocks of 6502 machine code into Python functions.
+
+A basic block is a run of instructions that is entered at its first instruction and left after its last one. Instead of
+dispatching every instruction of such a run separately, the run is translated into the source code of a single Python
+function, in which the operands, addressing modes and cycle counts are constants and the registers are local variables.
+
+The same templates generate one handler per opcode, which reads its operands at runtime, for executing single
+instructions.
+"""
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING
+
+from another6502.instructions import INSTRUCTIONS, AddressingMode, Instruction
+from another6502.utils import dec_to_bcd
+
+if TYPE_CHECKING:
+    from another6502.cpu import CPU6502
+
+MAX_BLOCK_INSTRUCTIONS = 64
+"""Maximum number of instructions compiled into one block."""
+
+REGISTERS = ("a", "x", "y", "sp", "status")
+"""Attributes of the CPU that are held in local variables by compiled blocks."""
+
+NZ_FLAGS = tuple((result & 0x80) | ((result == 0) << 1) for result in range(0x100))
+"""N and Z flags at their positions in the status register for each result byte."""
+
+_NOT_IN_BLOCKS = frozenset((
+    "BRK",  # interrupt sequence, handled by the CPU
+))
+"""Instructions that end a block and are executed one at a time by the CPU."""
+
+_STACK_PAGE = 0x01
+_ADDRESS_SPACE_SIZE = 0x10000
+
+_ASSIGNMENT = re.compile(r"^\s*([\w, ]+?)\s*(?:[-+&|^]|<<|>>)?=(?!=)")
+_WORD = re.compile(r"\b\w+\b")
+_CONSTANT_READ = re.compile(r"\bread\((0x[0-9a-f]+)\)")
+_FLAG_UPDATE = re.compile(r"^status (?:= \(status & 0x[0-9a-f]{2}\) \||[&|]= 0x)")
+
+
+@dataclass
+class CompiledBlock:
+    """Python function executing a basic block of 6502 machine code."""
+
+    start: int
+    """Address of the first instruction of the block."""
+
+    stop: int
+    """Address after the last instruction of the block."""
+
+    n_instructions: int
+    """Number of instructions in the block."""
+
+    function: Callable[["CPU6502"], None]
+    """Function executing the block on the CPU it is called with."""
+
+    source: str
+    """Python source code of `function`."""
+
+
+@dataclass(frozen=True)
+class _Operand:
+    """Expressions of the operand bytes of an instruction, either constants or variables read at runtime."""
+
+    lo: str
+    """Byte after the opcode."""
+
+    hi: str
+    """Second byte after the opcode."""
+
+    word: str
+    """Little endian word of both bytes."""
+
+    lo_next: str
+    """Address after `lo` in the zero page."""
+
+    @classmethod
+    def constant(cls, lo: int, hi: int) -> "_Operand":
+        """Return the expressions of an operand known at compile time."""
+        return cls(f"0x{lo:02x}", f"0x{hi:02x}", f"0x{hi:02x}{lo:02x}", f"0x{(lo + 1) & 0xff:02x}")
+
+
+_RUNTIME_OPERAND = _Operand("lo", "hi", "(hi << 8 | lo)", "(lo + 1) & 0xff")
+"""Operand read into the local variables `lo` and `hi` at runtime."""
+
+
+@dataclass
+class _Exit:
+    """Placeholder for leaving a block before its last instruction, rendered once the whole block is known."""
+
+    next_pc: int
+    cycles: int
+    address: str
+    """Expression of the address of a write that may have modified the remainder of the block."""
+
+
+def adc_decimal(a: int, value: int, status: int) -> tuple[int, int]:
+    """Add with carry in decimal mode.
+
+    Like the NMOS 6502, N, V and Z are set based on the binary result.
+
+    Returns:
+        (a, status): New values of the accumulator and the status register.
+
+    """
+    return _decimal_result(_decimal_results("ADC")[(a << 9) | (value << 1) | (status & 1)], status)
+
+
+def sbc_decimal(a: int, value: int, status: int) -> tuple[int, int]:
+    """Subtract with carry / borrow in decimal mode.
+
+    Like the NMOS 6502, N, V and Z are set based on the binary result.
+
+    Returns:
+        (a, status): New values of the accumulator and the status register.
+
+    """
+    return _decimal_result(_decimal_results("SBC")[(a << 9) | (value << 1) | (status & 1)], status)
+
+
+def _decimal_result(result: int, status: int) -> tuple[int, int]:
+    """Unpack an entry of a table of decimal results into the accumulator and the status register."""
+    if result < 0:
+        msg = "Decimal number must be between 0 and 99 inclusive."
+        raise ValueError(msg)
+    return result & 0xff, (status & 0x3c) | (result >> 8)
+
+
+@cache
+def _decimal_results(mnemonic: str) -> list[int]:
+    """Return the table of the results of ADC or SBC in decimal mode.
+
+    The table is laid out like the one of `adc_results`, with the BCD result in the low byte of each entry. Entries of
+    operands whose result cannot be represented in BCD are -1.
+    """
+    binary = adc_results()
+    results: list[int] = []
+    for a in range(0x100):
+        a_decimal = (a & 0xf) + (a >> 4) * 10
+        for value in range(0x100):
+            value_decimal = (value & 0xf) + (value >> 4) * 10
+            for carry in (0, 1):
+                if mnemonic == "ADC":
+                    decimal = a_decimal + value_decimal + carry
+                    decimal_carry = int(decimal >= 100)  # noqa: PLR2004
+                    decimal -= 100 * decimal_carry
+                    flags = binary[(a << 9) | (value << 1) | carry] >> 8
+                else:
+                    decimal = a_decimal - value_decimal + carry - 1
+                    decimal_carry = int(decimal >= 0)
+                    decimal += 100 * (1 - decimal_carry)
+                    flags = binary[(a << 9) | ((value ^ 0xff) << 1) | carry] >> 8
+                if not 0 <= decimal <= 99:  # noqa: PLR2004
+                    results.append(-1)
+                    continue
+                results.append(dec_to_bcd(decimal) | (((flags & ~1) | decimal_carry) << 8))
+    return results
+
+
+@cache
+def adc_results() -> list[int]:
+    """Return the table of the results of binary additions with carry.
+
+    The entry at index `a << 9 | value << 1 | carry` holds the sum in its low byte and the resulting status flags in
+    its high byte, with C, Z, V and N at their positions in the status register. Subtractions use the same table with
+    the inverted operand.
+
+    """
+    results: list[int] = []
+    for a in range(0x100):
+        for value in range(0x100):
+            for carry in (0, 1):
+                result = a + value + carry
+                flags = (result >> 8) | (result & 0x80) | (((result & 0xff) == 0) << 1)
+                flags |= (~(a ^ value) & (a ^ result) & 0x80) >> 1
+                results.append((result & 0xff) | (flags << 8))
+    return results
+
+
+def _nz(register: str) -> str:
+    """Return the line updating N and Z based on a register or variable."""
+    return f"status = (status & 0x7d) | nz_flags[{register}]"
+
+
+def _cnz(register: str) -> str:
+    """Return the line updating C, N and Z based on `carry` and a register or variable."""
+    return f"status = (status & 0x7c) | carry | nz_flags[{register}]"
+
+
+_LOADS = {"LDA": "a", "LDX": "x", "LDY": "y"}
+_STORES = {"STA": "a", "STX": "x", "STY": "y"}
+_TRANSFERS = {"TAX": ("a", "x"), "TAY": ("a", "y"), "TSX": ("sp", "x"), "TXA": ("x", "a"), "TYA": ("y", "a")}
+_INCREMENTS = {"INX": ("x", "+"), "INY": ("y", "+"), "DEX": ("x", "-"), "DEY": ("y", "-")}
+_MEMORY_INCREMENTS = {"INC": "+", "DEC": "-"}
+_LOGIC = {"AND": "&", "ORA": "|", "EOR": "^"}
+_COMPARES = {"CMP": "a", "CPX": "x", "CPY": "y"}
+_FLAGS = {
+    "CLC": "status &= 0xfe",
+    "SEC": "status |= 0x01",
+    "CLI": "status &= 0xfb",
+    "SEI": "status |= 0x04",
+    "CLD": "status &= 0xf7",
+    "SED": "status |= 0x08",
+    "CLV": "status &= 0xbf",
+}
+_SHIFTS = {
+    "ASL": ("carry = {0} >> 7", "{0} = ({0} << 1) & 0xff"),
+    "LSR": ("carry = {0} & 1", "{0} >>= 1"),
+    "ROL": ("{0} = ({0} << 1) | (status & 1)", "carry = {0} >> 8", "{0} &= 0xff"),
+    "ROR": ("carry = {0} & 1", "{0} = ({0} >> 1) | ((status & 1) << 7)"),
+}
+_BRANCHES = {
+    "BPL": "not status & 0x80",
+    "BMI": "status & 0x80",
+    "BVC": "not status & 0x40",
+    "BVS": "status & 0x40",
+    "BCC": "not status & 0x01",
+    "BCS": "status & 0x01",
+    "BNE": "not status & 0x02",
+    "BEQ": "status & 0x02",
+}
+
+_FLAG_EFFECTS = {
+    **dict.fromkeys(("LDA", "LDX", "LDY", "TAX", "TAY", "TSX", "TXA", "TYA", "PLA"), (0x00, 0x82)),
+    **dict.fromkeys(("INX", "INY", "DEX", "DEY", "INC", "DEC", "AND", "ORA", "EOR"), (0x00, 0x82)),
+    **dict.fromkeys(("ASL", "LSR", "CMP", "CPX", "CPY"), (0x00, 0x83)),
+    **dict.fromkeys(("ROL", "ROR"), (0x01, 0x83)),
+    **dict.fromkeys(("ADC", "SBC"), (0x09, 0xc3)),
+    "BIT": (0x00, 0xc2),
+    "CLC": (0x00, 0x01),
+    "SEC": (0x00, 0x01),
+    "CLI": (0x00, 0x04),
+    "SEI": (0x00, 0x04),
+    "CLD": (0x00, 0x08),
+    "SED": (0x00, 0x08),
+    "CLV": (0x00, 0x40),
+    "PHP": (0xff, 0x00),
+    "PLP": (0x00, 0xff),
+    "RTI": (0x00, 0xff),
+    "BPL": (0x80, 0x00),
+    "BMI": (0x80, 0x00),
+    "BVC": (0x40, 0x00),
+    "BVS": (0x40, 0x00),
+    "BCC": (0x01, 0x00),
+    "BCS": (0x01, 0x00),
+    "BNE": (0x02, 0x00),
+    "BEQ": (0x02, 0x00),
+}
+"""Masks of the flags that an instruction reads and overwrites, for instructions that use the status register."""
+
+
+def _address(mode: AddressingMode, operand: _Operand) -> tuple[list[str], str, str | None]:  # noqa: PLR0911
+    """Return the code resolving the effective address of an operand.
+
+    Returns:
+        (lines, address, crossed): Lines computing the address, an expression of the address and an expression that is
+        true if indexing has crossed a page boundary, if the mode indexes across pages.
+
+    """
+    match mode:
+        case AddressingMode.IMMEDIATE:
+            msg = "Immediate operands have no address."
+            raise ValueError(msg)
+        case AddressingMode.ZERO_PAGE:
+            return [], operand.lo, None
+        case AddressingMode.ZERO_PAGE_X:
+            return [f"addr = ({operand.lo} + x) & 0xff"], "addr", None
+        case AddressingMode.ZERO_PAGE_Y:
+            return [f"addr = ({operand.lo} + y) & 0xff"], "addr", None
+        case AddressingMode.ABSOLUTE:
+            return [], operand.word, None
+        case AddressingMode.ABSOLUTE_X:
+            return [f"addr = ({operand.word} + x) & 0xffff"], "addr", f"addr >> 8 != {operand.hi}"
+        case AddressingMode.ABSOLUTE_Y:
+            return [f"addr = ({operand.word} + y) & 0xffff"], "addr", f"addr >> 8 != {operand.hi}"
+        case AddressingMode.INDIRECT_X:
+            return [
+                f"addr = ({operand.lo} + x) & 0xff",
+                "addr = read(addr) | (read((addr + 1) & 0xff) << 8)",
+            ], "addr", None
+        case AddressingMode.INDIRECT_Y:
+            return [
+                f"base = read({operand.lo}) | (read({operand.lo_next}) << 8)",
+                "addr = (base + y) & 0xffff",
+            ], "addr", "(addr ^ base) > 0xff"
+
+
+def _operand(mode: AddressingMode, operand: _Operand) -> tuple[list[str], str, str | None]:
+    """Return the code reading the operand of an instruction.
+
+    Returns:
+        (lines, value, crossed): Lines computing the operand, an expression of the operand and an expression that is
+        true if indexing has crossed a page boundary, if the mode indexes across pages.
+
+    """
+    if mode == AddressingMode.IMMEDIATE:
+        return [], operand.lo, None
+    lines, address, crossed = _address(mode, operand)
+    return lines, f"read({address})", crossed
+
+
+def _arithmetic(mnemonic: str, value: str) -> list[str]:
+    """Return the lines of ADC or SBC with an operand expression."""
+    decimal = "adc_decimal" if mnemonic == "ADC" else "sbc_decimal"
+    lines = [
+        f"value = {value}",
+        "if status & 0x08:",
+        f"    a, status = {decimal}(a, value, status)",
+        "else:",
+    ]
+    if mnemonic == "SBC":
+        lines.append("    value ^= 0xff")
+    lines += [
+        "    result = adc_results[(a << 9) | (value << 1) | (status & 1)]",
+        "    status = (status & 0x3c) | (result >> 8)",
+        "    a = result & 0xff",
+    ]
+    return lines
+
+
+def _instruction(  # noqa: C901, PLR0911, PLR0912
+    instruction: Instruction,
+    operand: _Operand,
+) -> tuple[list[str], str | None, str | None]:
+    """Return the code of an instruction that continues with the next instruction.
+
+    Args:
+        instruction: Instruction to translate.
+        operand: Operand of the instruction.
+
+    Returns:
+        (lines, crossed, written): Lines of the instruction, an expression that is true if the instruction takes an
+        extra cycle for crossing a page boundary and an expression of the address the instruction writes to.
+
+    """
+    mnemonic, mode = instruction.mnemonic, instruction.mode
+    if mnemonic in _LOADS:
+        assert mode is not None  # noqa: S101
+        register = _LOADS[mnemonic]
+        lines, value, crossed = _operand(mode, operand)
+        return [*lines, f"{register} = {value}", _nz(register)], crossed, None
+    if mnemonic in _STORES:
+        assert mode is not None  # noqa: S101
+        lines, address, _ = _address(mode, operand)
+        return [*lines, f"write({address}, {_STORES[mnemonic]})"], None, address
+    if mnemonic in _TRANSFERS:
+        source, destination = _TRANSFERS[mnemonic]
+        return [f"{destination} = {source}", _nz(destination)], None, None
+    if mnemonic == "TXS":
+        return ["sp = x"], None, None
+    if mnemonic in _INCREMENTS:
+        register, operator = _INCREMENTS[mnemonic]
+        return [f"{register} = ({register} {operator} 1) & 0xff", _nz(register)], None, None
+    if mnemonic in _MEMORY_INCREMENTS:
+        assert mode is not None  # noqa: S101
+        lines, address, _ = _address(mode, operand)
+        return [
+            *lines,
+            f"value = (read({address}) {_MEMORY_INCREMENTS[mnemonic]} 1) & 0xff",
+            f"write({address}, value)",
+            _nz("value"),
+        ], None, address
+    if mnemonic in _SHIFTS:
+        if mode is None:
+            return [*(line.format("a") for line in _SHIFTS[mnemonic]), _cnz("a")], None, None
+        lines, address, _ = _address(mode, operand)
+        return [
+            *lines,
+            f"value = read({address})",
+            *(line.format("value") for line in _SHIFTS[mnemonic]),
+            f"write({address}, value)",
+            _cnz("value"),
+        ], None, address
+    if mnemonic in _LOGIC:
+        assert mode is not None  # noqa: S101
+        lines, value, crossed = _operand(mode, operand)
+        return [*lines, f"a {_LOGIC[mnemonic]}= {value}", _nz("a")], crossed, None
+    if mnemonic in {"ADC", "SBC"}:
+        assert mode is not None  # noqa: S101
+        lines, value, crossed = _operand(mode, operand)
+        return [*lines, *_arithmetic(mnemonic, value)], crossed, None
+    if mnemonic in _COMPARES:
+        assert mode is not None  # noqa: S101
+        lines, value, crossed = _operand(mode, operand)
+        return [
+            *lines,
+            f"result = {_COMPARES[mnemonic]} - {value}",
+            "status = (status & 0x7c) | (result >= 0) | nz_flags[result & 0xff]",
+        ], crossed, None
+    if mnemonic == "BIT":
+        assert mode is not None  # noqa: S101
+        lines, value, _ = _operand(mode, operand)
+        return [
+            *lines,
+            f"value = {value}",
+            "status = (status & 0x3d) | (value & 0xc0) | (((a & value) == 0) << 1)",
+        ], None, None
+    if mnemonic in _FLAGS:
+        return [_FLAGS[mnemonic]], None, None
+    if mnemonic == "NOP":
+        return [], None, None
+    if mnemonic in {"PHA", "PHP"}:
+        value = "a" if mnemonic == "PHA" else "status | 0x10"
+        return [f"write(0x100 + sp, {value})", "sp = (sp - 1) & 0xff"], None, None
+    if mnemonic == "PLA":
+        return ["sp = (sp + 1) & 0xff", "a = read(0x100 + sp)", _nz("a")], None, None
+    if mnemonic == "PLP":
+        return ["sp = (sp + 1) & 0xff", "status = read(0x100 + sp) & 0xef"], None, None
+    msg = f"Cannot compile instruction {mnemonic}."
+    raise ValueError(msg)
+
+
+def _control_flow(instruction: Instruction, pc: int, lo: int, hi: int) -> list[str]:
+    """Return the code of a control flow instruction at a known address that sets the local variable `pc`."""
+    mnemonic = instruction.mnemonic
+    next_pc = pc + instruction.length
+    if mnemonic in _BRANCHES:
+        target = (next_pc + lo - ((lo & 0x80) << 1)) & 0xffff
+        extra = 1 + ((next_pc & 0xff00) != (target & 0xff00))
+        return [
+            f"if {_BRANCHES[mnemonic]}:",
+            f"    pc = 0x{target:04x}",
+            f"    extra += {extra}",
+            "else:",
+            f"    pc = 0x{next_pc:04x}",
+        ]
+    if mnemonic == "JMP" and instruction.mode is not None:
+        return [f"pc = 0x{hi:02x}{lo:02x}"]
+    if mnemonic == "JMP":
+        # reproduces the NMOS 6502's hardware bug, see `CPU6502.jmp`
+        return [f"pc = read(0x{hi:02x}{lo:02x}) | (read(0x{hi:02x}{(lo + 1) & 0xff:02x}) << 8)"]
+    if mnemonic == "JSR":
+        return_addr = pc + 2
+        return [
+            f"write(0x100 + sp, 0x{return_addr >> 8:02x})",
+            "sp = (sp - 1) & 0xff",
+            f"write(0x100 + sp, 0x{return_addr & 0xff:02x})",
+            "sp = (sp - 1) & 0xff",
+            f"pc = 0x{hi:02x}{lo:02x}",
+        ]
+    if mnemonic == "RTS":
+        return [
+            "sp = (sp + 1) & 0xff",
+            "pc = read(0x100 + sp)",
+            "sp = (sp + 1) & 0xff",
+            "pc = (pc | (read(0x100 + sp) << 8)) + 1",
+        ]
+    if mnemonic == "RTI":
+        return _runtime_control_flow(instruction)
+    msg = f"Cannot compile instruction {mnemonic}."
+    raise ValueError(msg)
+
+
+def _runtime_control_flow(instruction: Instruction) -> list[str]:
+    """Return the code of a control flow instruction that sets the local variable `pc`.
+
+    Before the code, `pc` is the address after the opcode and `lo` and `hi` are the operand bytes, except for branches,
+    which only read their offset when they are taken.
+    """
+    mnemonic = instruction.mnemonic
+    if mnemonic in _BRANCHES:
+        return [
+            f"if {_BRANCHES[mnemonic]}:",
+            "    lo = read(pc)",
+            "    target = (pc + 1 + lo - ((lo & 0x80) << 1)) & 0xffff",
+            "    extra += 1 + ((target & 0xff00) != ((pc + 1) & 0xff00))",
+            "    pc = target",
+            "else:",
+            "    pc += 1",
+        ]
+    if mnemonic == "JMP" and instruction.mode is not None:
+        return ["pc = hi << 8 | lo"]
+    if mnemonic == "JMP":
+        # reproduces the NMOS 6502's hardware bug, see `CPU6502.jmp`
+        return ["pc = read(hi << 8 | lo) | (read(hi << 8 | ((lo + 1) & 0xff)) << 8)"]
+    if mnemonic == "JSR":
+        return [
+            "pc = (pc + 1) & 0xffff",
+            "write(0x100 + sp, pc >> 8)",
+            "sp = (sp - 1) & 0xff",
+            "write(0x100 + sp, pc & 0xff)",
+            "sp = (sp - 1) & 0xff",
+            "pc = hi << 8 | lo",
+        ]
+    if mnemonic == "RTS":
+        return _control_flow(instruction, 0, 0, 0)
+    if mnemonic == "RTI":
+        return [
+            "sp = (sp + 1) & 0xff",
+            "status = read(0x100 + sp) & 0xef",
+            "sp = (sp + 1) & 0xff",
+            "pc = read(0x100 + sp)",
+            "sp = (sp + 1) & 0xff",
+            "pc |= read(0x100 + sp) << 8",
+        ]
+    msg = f"Cannot compile instruction {mnemonic}."
+    raise ValueError(msg)
+
+
+def _is_control_flow(instruction: Instruction) -> bool:
+    """Check if an instruction transfers control somewhere else than the next instruction."""
+    return instruction.mnemonic in _BRANCHES or instruction.mnemonic in {"JMP", "JSR", "RTS", "RTI"}
+
+
+def compile_block(  # noqa: C901, PLR0912, PLR0915
+    read: Callable[[int], int],
+    write: Callable[[int, int], None],
+    start: int,
+    buffer: bytearray | None = None,
+    pages: list[memoryview | None] | None = None,
+) -> CompiledBlock | None:
+    """Compile the basic block starting at an address.
+
+    The block ends after the first branch, jump or return, before instructions that are executed by the CPU itself
+    (e.g., BRK), before instructions that an earlier instruction of the block writes to, before instructions on pages
+    without a view in `pages` and after at most `MAX_BLOCK_INSTRUCTIONS` instructions. Writes to addresses that are
+    only known at runtime leave the block early when they modify one of its remaining instructions.
+
+    Args:
+        read: Function reading a byte from memory. Used for compiling and by the compiled code.
+        write: Function writing a byte to memory. Used by the compiled code.
+        start: Address of the first instruction of the block.
+        buffer: Contents of the whole address space, if the memory is plain RAM, i.e., reads have no side effects. The
+            compiled code indexes it directly instead of calling `read`.
+        pages: Views of the pages of plain RAM, see `Memory.page_buffer`. Otherwise, the compiled code indexes them
+            directly when it reads from a constant address or the stack. Code is only read from pages with a view, so
+            compiling never reads memory-mapped I/O.
+
+    Returns:
+        block: The compiled block or None if the instruction at `start` cannot be compiled.
+
+    """
+    instructions: list[tuple[str, list[str | _Exit]]] = []
+    static_writes: set[int] = set()
+    pc = start
+    n_instructions = 0
+    cycles = 0
+    ends_with_control_flow = False
+    while n_instructions < MAX_BLOCK_INSTRUCTIONS:
+        # reading code ahead from memory-mapped I/O could trigger side effects of a peripheral
+        if pages is not None and (pc >= _ADDRESS_SPACE_SIZE or pages[pc >> 8] is None):
+            break
+        instruction = INSTRUCTIONS.get(read(pc))
+        if instruction is None or instruction.mnemonic in _NOT_IN_BLOCKS:
+            break
+        # code on the stack page could be modified by any push
+        if pc >> 8 == _STACK_PAGE or pc + instruction.length > _ADDRESS_SPACE_SIZE:
+            break
+        if pages is not None and pages[(pc + instruction.length - 1) >> 8] is None:
+            break
+        if any(pc <= address < pc + instruction.length for address in static_writes):
+            break
+
+        lo = read(pc + 1) if instruction.length > 1 else 0
+        hi = read(pc + 2) if instruction.length > 2 else 0  # noqa: PLR2004
+        if _is_control_flow(instruction):
+            lines, crossed, written = _control_flow(instruction, pc, lo, hi), None, None
+        else:
+            lines, crossed, written = _instruction(instruction, _Operand.constant(lo, hi))
+        cycles += instruction.cycles
+        code: list[str | _Exit] = [f"# ${pc:04x}: {instruction.mnemonic}", *lines]
+        if instruction.page_penalty and crossed is not None:
+            code.append(f"extra += {crossed}")
+        pc += instruction.length
+        n_instructions += 1
+
+        if written is not None:
+            if written.startswith("0x"):
+                static_writes.add(int(written, 16))
+            else:
+                code.append(_Exit(pc, cycles, written))
+        instructions.append((instruction.mnemonic, code))
+        if _is_control_flow(instruction):
+            ends_with_control_flow = True
+            break
+
+    if n_instructions == 0:
+        return None
+
+    body = _eliminate_dead_flags(instructions)
+    if buffer is not None:
+        body = [_index_reads(line) if isinstance(line, str) else line for line in body]
+    elif pages is not None:
+        body = [_fold_reads(line, pages) if isinstance(line, str) else line for line in body]
+    source = _render(
+        "block",
+        f"Execute the block ${start:04x} to ${pc - 1:04x}.",
+        header=[],
+        body=body,
+        pc="pc" if ends_with_control_flow else f"0x{pc:04x}",
+        cycles=cycles,
+        stop=pc,
+    )
+    namespace: dict[str, object] = {
+        "read": read,
+        "write": write,
+        "mem": buffer,
+        "adc_decimal": adc_decimal,
+        "sbc_decimal": sbc_decimal,
+        "adc_results": adc_results(),
+        "nz_flags": NZ_FLAGS,
+    }
+    if pages is not None:
+        namespace.update((f"page_{page:02x}", view) for page, view in enumerate(pages) if view is not None)
+    exec(compile(source, f"<block ${start:04x}>", "exec"), namespace)  # noqa: S102
+    function: Callable[[CPU6502], None] = namespace["block"]  # type: ignore[assignment]
+    return CompiledBlock(start, pc, n_instructions, function, source)
+
+
+def _eliminate_dead_flags(instructions: list[tuple[str, list[str | _Exit]]]) -> list[str | _Exit]:
+    """Concatenate the code of the instructions of a block, leaving out flag updates that are never observed.
+
+    The status register is only observable when the block is left, so an update of flags that a later instruction of
+    the block overwrites before anything reads them is dead. This is found by walking the block backwards while
+    tracking the mask of live flags.
+
+    Args:
+        instructions: Mnemonic and code of each instruction of the block.
+
+    Returns:
+        body: Code of the whole block.
+
+    """
+    codes: list[list[str | _Exit]] = []
+    live = 0xff
+    for mnemonic, code in reversed(instructions):
+        if any(isinstance(line, _Exit) for line in code):
+            live = 0xff
+        reads, writes = _FLAG_EFFECTS.get(mnemonic, (0x00, 0x00))
+        if not writes & live:
+            code = [line for line in code if not (isinstance(line, str) and _FLAG_UPDATE.match(line))]  # noqa: PLW2901
+        live = (live & ~writes) | reads
+        codes.append(code)
+    return [line for code in reversed(codes) for line in code]
+
+
+def _index_reads(line: str) -> str:
+    """Replace the calls of `read` in a line of code with subscriptions of `mem`."""
+    while (start := line.find("read(")) != -1:
+        depth = 0
+        end = start + len("read")
+        for end in range(start + len("read"), len(line)):
+            depth += {"(": 1, ")": -1}.get(line[end], 0)
+            if depth == 0:
+                break
+        line = f"{line[:start]}mem[{line[start + len('read('):end]}]{line[end + 1:]}"
+    return line
+
+
+def _fold_reads(line: str, pages: list[memoryview | None]) -> str:
+    """Replace reads from constant addresses and the stack in a line of code with subscriptions of page buffers."""
+
+    def fold(match: re.Match[str]) -> str:
+        address = int(match.group(1), 16)
+        if pages[address >> 8] is None:
+            return match.group(0)
+        return f"page_{address >> 8:02x}[0x{address & 0xff:02x}]"
+
+    line = _CONSTANT_READ.sub(fold, line)
+    if pages[_STACK_PAGE] is not None:
+        line = line.replace("read(0x100 + sp)", f"page_{_STACK_PAGE:02x}[sp]")
+    return line
+
+
+def compile_handlers(
+    read: Callable[[int], int],
+    write: Callable[[int, int], None],
+    buffer: bytearray | None = None,
+) -> dict[int, Callable[["CPU6502"], None]]:
+    """Return a handler for every opcode that can be compiled.
+
+    A handler executes one instruction on the CPU it is called with. Like the methods of the CPU that implement
+    instructions, it expects the program counter to point to the byte after the opcode.
+
+    Args:
+        read: Function reading a byte from memory.
+        write: Function writing a byte to memory.
+        buffer: Contents of the whole address space, if the memory is plain RAM, see `compile_block`. The handlers
+            index it directly to read their data, but still fetch their operands with `read`, as these can lie past
+            the end of the address space.
+
+    Returns:
+        handlers: Mapping from opcodes to handlers.
+
+    """
+    return _handler_factory(indexed=buffer is not None)(read, write, buffer)
+
+
+@cache
+def _handler_factory(*, indexed: bool) -> Callable[..., dict[int, Callable[["CPU6502"], None]]]:
+    """Compile a function that creates the handlers of all opcodes as closures over `read`, `write` and `mem`."""
+    source = ["def make_handlers(read, write, mem):"]
+    names: dict[int, str] = {}
+    for opcode, instruction in sorted(INSTRUCTIONS.items()):
+        if instruction.mnemonic == "BRK":
+            continue
+        names[opcode] = f"handle_{opcode:02x}"
+        handler = _handler_source(names[opcode], instruction, indexed=indexed)
+        source += (f"    {line}" for line in handler.splitlines())
+    source.append("    return {" + ", ".join(f"0x{opcode:02x}: {name}" for opcode, name in names.items()) + "}")
+
+    namespace: dict[str, object] = {
+        "adc_decimal": adc_decimal,
+        "sbc_decimal": sbc_decimal,
+        "adc_results": adc_results(),
+        "nz_flags": NZ_FLAGS,
+    }
+    exec(compile("\n".join(source) + "\n", "<handlers>", "exec"), namespace)  # noqa: S102
+    return namespace["make_handlers"]  # type: ignore[return-value]
+
+
+def _handler_source(name: str, instruction: Instruction, *, indexed: bool = False) -> str:
+    """Return the source code of the handler of an opcode, which indexes `mem` to read its data if `indexed` is set."""
+    operand: list[str] = []
+    if instruction.mode is not None or instruction.mnemonic in {"JMP", "JSR"}:
+        operand.append("lo = read(pc)")
+    if instruction.length == 3:  # noqa: PLR2004
+        # like the methods of the CPU, only JMP and JSR wrap around at the end of memory
+        wrap = instruction.mnemonic in {"JMP", "JSR"}
+        operand.append("hi = read((pc + 1) & 0xffff)" if wrap else "hi = read(pc + 1)")
+
+    body: list[str | _Exit]
+    if _is_control_flow(instruction):
+        body = [*operand, *_runtime_control_flow(instruction)]
+        pc = "pc"
+    else:
+        lines, crossed, _ = _instruction(instruction, _RUNTIME_OPERAND)
+        if indexed:
+            lines = [_index_reads(line) for line in lines]
+        body = [*operand, *lines]
+        if instruction.page_penalty and crossed is not None:
+            body.append(f"extra += {crossed}")
+        pc = f"pc + {instruction.length - 1}" if instruction.length > 1 else None
+
+    header = ["pc = cpu.pc"] if pc is not None else []
+    return _render(
+        name,
+        f"Execute the {instruction.mnemonic} instruction.",
+        header=header,
+        body=body,
+        pc=pc,
+        cycles=instruction.cycles,
+        stop=0,
+    )
+
+
+def _render(  # noqa: PLR0913
+    name: str,
+    docstring: str,
+    *,
+    header: list[str],
+    body: list[str | _Exit],
+    pc: str | None,
+    cycles: int,
+    stop: int,
+) -> str:
+    """Return the source code of a function executing instructions.
+
+    Args:
+        name: Name of the function.
+        docstring: Docstring of the function.
+        header: Lines initializing local variables other than registers.
+        body: Lines of the instructions and placeholders for leaving early.
+        pc: Expression of the program counter after the instructions or None if it does not change.
+        cycles: Cycles the instructions take without extra cycles.
+        stop: Address after the instructions, for leaving early.
+
+    """
+    lines = [line for line in body if isinstance(line, str)]
+    used = {word for line in lines if not line.startswith("#") for word in _WORD.findall(line)}
+    assigned = {
+        target.strip()
+        for line in lines
+        if (match := _ASSIGNMENT.match(line))
+        for target in match.group(1).split(",")
+    }
+    registers = [register for register in REGISTERS if register in used]
+    has_extra = "extra" in used
+
+    def epilogue(indent: str, next_pc: str | None, cycles: int) -> list[str]:
+        return [
+            *(f"{indent}cpu.{register} = {register}" for register in REGISTERS if register in assigned),
+            *([f"{indent}cpu.pc = {next_pc}"] if next_pc is not None else []),
+            f"{indent}cpu.cycles += {cycles}" + (" + extra" if has_extra else ""),
+        ]
+
+    source = [
+        f"def {name}(cpu):",
+        f'    """{docstring}"""',
+        *(f"    {line}" for line in header),
+        *(f"    {register} = cpu.{register}" for register in registers),
+    ]
+    if has_extra:
+        source.append("    extra = 0")
+    for line in body:
+        if isinstance(line, str):
+            source.append(f"    {line}")
+        elif line.next_pc < stop:
+            source.append(f"    if 0x{line.next_pc:04x} <= {line.address} < 0x{stop:04x}:")
+            source += epilogue("        ", f"0x{line.next_pc:04x}", line.cycles)
+            source.append("        return")
+    source += epilogue("    ", pc, cycles)
+    return "\n".join(source) + "\n"
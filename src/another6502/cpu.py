@@ -1,30 +1,24 @@
 """CPU Logic."""
 
 import enum
+import inspect
 import logging
+import threading
 import time
 from collections.abc import Callable
 from functools import partial
+from types import MethodType
 from typing import Any, ClassVar, Literal
 
-from another6502.memory import Memory
-from another6502.utils import assert_never, dec_to_bcd
+from another6502.codegen import NZ_FLAGS, CompiledBlock, compile_block, compile_handlers
+from another6502.instructions import AddressingMode
+from another6502.memory import Memory, MemoryBlock
+from another6502.utils import dec_to_bcd
 
 logger = logging.getLogger(__name__)
 
-
-class AddressingMode(enum.Enum):
-    """Addressing mode of a 6502 instruction."""
-
-    IMMEDIATE = enum.auto()
-    ZERO_PAGE = enum.auto()
-    ZERO_PAGE_X = enum.auto()
-    ZERO_PAGE_Y = enum.auto()
-    ABSOLUTE = enum.auto()
-    ABSOLUTE_X = enum.auto()
-    ABSOLUTE_Y = enum.auto()
-    INDIRECT_X = enum.auto()
-    INDIRECT_Y = enum.auto()
+TICKS_PER_SECOND = 100
+"""Rate at which `run` calls the interrupt hook when the execution speed is limited, in emulated time."""
 
 
 class StepResult(enum.Enum):
@@ -35,14 +29,19 @@ class StepResult(enum.Enum):
 
 
 def opcode(opcode: int, **kwargs: Any) -> Callable[..., Callable[..., None]]:  # noqa: ANN401
-    """Register a set of arguments to an opcode."""
+    """Register a set of arguments to an opcode.
+
+    The arguments are stored in the order of the method's parameters, so handlers can pass them positionally, which is
+    cheaper than passing keyword arguments on every call.
+    """
     def decorator(func: Callable[..., None]) -> Callable[..., None]:
         if not hasattr(func, "opcodes"):
             func.opcodes = []  # type: ignore[reportFunctionMemberAccess]
         if opcode in (op for op, _ in func.opcodes):  # type: ignore[reportFunctionMemberAccess]
             msg = f"Opcode 0x{opcode:02x} has already been registered for this function."
             raise ValueError(msg)
-        func.opcodes.append((opcode, kwargs))  # type: ignore[reportUnknownMemberType]
+        args = inspect.signature(func).bind_partial(None, **kwargs).args[1:]  # skip `self`
+        func.opcodes.append((opcode, args))  # type: ignore[reportUnknownMemberType]
         return func
     return decorator
 
@@ -50,6 +49,31 @@ def opcode(opcode: int, **kwargs: Any) -> Callable[..., Callable[..., None]]:  #
 class CPU6502:
     """A behavioral model of the MOS6502."""
 
+    # every instruction reads and writes several of these, slots are faster to access than the instance dictionary,
+    # which is kept so that class constants like `BLOCK_COMPILE_THRESHOLD` can still be overridden per instance
+    __slots__ = (
+        "__dict__",
+        "_block_cache",
+        "_block_code",
+        "_block_heat",
+        "_brk_pending",
+        "_buffer",
+        "_decode_cache",
+        "_memory_write",
+        "_page_buffers",
+        "_read",
+        "_stack",
+        "a",
+        "cycles",
+        "memory",
+        "opcodes",
+        "pc",
+        "sp",
+        "status",
+        "x",
+        "y",
+    )
+
     STATUS_C = 0
     STATUS_Z = 1
     STATUS_I = 2
@@ -58,12 +82,30 @@ class CPU6502:
     STATUS_V = 6
     STATUS_N = 7
 
+    NZ_MASK = (1 << STATUS_N) | (1 << STATUS_Z)
+    """Mask of the N and Z flags, N is bit 7 like the sign bit of a result."""
+
+    NZC_MASK = NZ_MASK | (1 << STATUS_C)
+    """Mask of the flags updated by shifts, rotations and comparisons."""
+
+    NVZ_MASK = NZ_MASK | (1 << STATUS_V)
+    """Mask of the flags updated by BIT, N and V are bits 7 and 6 like in the operand."""
+
+    NVZC_MASK = NZC_MASK | (1 << STATUS_V)
+    """Mask of the flags updated by ADC and SBC."""
+
+    INITIAL_STATUS = (1 << STATUS_Z) | (1 << STATUS_I) | (1 << 5)
+    """Value of the status register after initialization, the unused bit 5 is usually set."""
+
     STACK_ROOT = 0x0100
 
     NMI_VECTOR = 0xfffa
     RST_VECTOR = 0xfffc
     IRQ_VECTOR = 0xfffe
 
+    BLOCK_COMPILE_THRESHOLD = 4
+    """Number of times execution has to reach an address before the basic block starting there is compiled."""
+
     LOAD_CYCLE_COUNTS: ClassVar[dict[AddressingMode, int]] = {
         AddressingMode.IMMEDIATE: 2,
         AddressingMode.ZERO_PAGE: 3,
@@ -76,11 +118,10 @@ class CPU6502:
         AddressingMode.INDIRECT_Y: 5,
     }
 
-    LOAD_EXTRA_CYCLE_MODES: ClassVar[tuple[AddressingMode, ...]] = (
-        AddressingMode.ABSOLUTE_X,
-        AddressingMode.ABSOLUTE_Y,
-        AddressingMode.INDIRECT_Y,
+    LOAD_EXTRA_CYCLE_MASK = (
+        (1 << AddressingMode.ABSOLUTE_X) | (1 << AddressingMode.ABSOLUTE_Y) | (1 << AddressingMode.INDIRECT_Y)
     )
+    """Bit mask of the addressing modes in which loads take an extra cycle when indexing crosses a page boundary."""
 
     STORE_CYCLE_COUNTS: ClassVar[dict[AddressingMode, int]] = {
         AddressingMode.ZERO_PAGE: 3,
@@ -112,11 +153,10 @@ class CPU6502:
         AddressingMode.INDIRECT_Y: 5,
     }
 
-    BINARY_EXTRA_CYCLE_MODES: ClassVar[tuple[AddressingMode, ...]] = (
-        AddressingMode.ABSOLUTE_X,
-        AddressingMode.ABSOLUTE_Y,
-        # INDIRECT_Y only on some
+    BINARY_EXTRA_CYCLE_MASK = (
+        (1 << AddressingMode.ABSOLUTE_X) | (1 << AddressingMode.ABSOLUTE_Y) | (1 << AddressingMode.INDIRECT_Y)
     )
+    """Bit mask of the addressing modes in which binary operations take an extra cycle when crossing a page boundary."""
 
     def __init__(self, memory: Memory, override_initial_pc: int | None = None) -> None:
         """Initialize a CPU with memory.
@@ -129,163 +169,277 @@ class CPU6502:
         self.y: int = 0
         self.pc: int = 0
         self.sp: int = 0xff
-        self.status: int = 0
+        self.status: int = self.INITIAL_STATUS
         self.cycles: int = 0
 
+        # set when BRK is executed, so `step` can report it
+        self._brk_pending = False
+
         self.memory = memory
+        # bind the memory accessors once, so hot paths do not have to look them up on `memory` on every access
+        self._read = memory.read
+        self._memory_write = memory.write
+        # compiled code reads plain RAM that covers the whole address space directly, or at least its pages
+        self._buffer = memory.mem if isinstance(memory, MemoryBlock) and len(memory) == 0x10000 else None  # noqa: PLR2004
+        self._page_buffers = [memory.page_buffer(page) for page in range(0x100)] if self._buffer is None else None
         self.opcodes = self.build_opcode_table()
 
-        # initial values for the status register
-        self.status |= (1 << self.STATUS_Z)
-        self.status |= (1 << self.STATUS_I)
-        self.status |= (1 << 5)  # unused bit of the status register is usually set
+        # handler of the instruction at each address, filled when the address is first executed
+        self._decode_cache: list[Callable[[], None] | None] = [None] * 0x10000
+
+        # compiled basic block starting at each address, None if the instruction there cannot be compiled
+        self._block_cache: dict[int, CompiledBlock | None] = {}
+        # number of times each address has been executed by `step_block` before its block was compiled
+        self._block_heat: dict[int, int] = {}
+        # nonzero for every address that belongs to a compiled basic block
+        self._block_code = bytearray(0x10000)
+        # pulls read the stack page directly if possible, pushes use `_write` to invalidate code on the stack page
+        self._stack = memory.page_buffer(self.STACK_ROOT >> 8)
 
         # set program counter based on reset vector
         if override_initial_pc is not None:
             self.pc = override_initial_pc
         else:
-            rst_lo = self.memory.read(self.RST_VECTOR)
-            rst_hi = self.memory.read(self.RST_VECTOR + 1)
+            rst_lo = self._read(self.RST_VECTOR)
+            rst_hi = self._read(self.RST_VECTOR + 1)
             self.pc = (rst_hi << 8) | rst_lo
 
-    def build_opcode_table(self) -> dict[int, Callable[[], None]]:
-        """Return a map between opcode and method that contains the logic for the instruction."""
-        opcode_table: dict[int, Callable[[], None]] = {}
-        for attr_name in dir(self):
-            attr = getattr(self, attr_name)
-            func = getattr(attr, "__func__", attr)
+    def build_opcode_table(self, *, compiled: bool = True) -> list[Callable[[], None]]:
+        """Return a table that maps each opcode to the method that contains the logic for the instruction.
 
-            if not hasattr(func, "opcodes"):
+        The table has one entry for each of the 256 possible opcodes, so it can be indexed directly with the opcode
+        byte. Opcodes without an implementation are mapped to `unhandled_opcode`.
+
+        If `compiled` is set, the methods are replaced by handlers generated from the templates of the block compiler
+        where possible, see `another6502.codegen.compile_handlers`. They inline addressing and cycle counting and keep
+        the registers in local variables.
+        """
+        opcode_table: list[Callable[[], None] | None] = [None] * 256
+        for attr_name in dir(type(self)):
+            func = getattr(type(self), attr_name)
+            if not inspect.isfunction(func) or not hasattr(func, "opcodes"):
                 continue
+            attr = getattr(self, attr_name)
 
-            for opcode, kwargs in func.opcodes:
-                if opcode in opcode_table:
+            for opcode, args in func.opcodes:
+                if opcode_table[opcode] is not None:
                     msg = f"Opcode 0x{opcode:02x} has already been registered."
                     raise ValueError(msg)
-                opcode_table[opcode] = partial(attr, **kwargs)
+                opcode_table[opcode] = partial(attr, *args) if args else attr
+
+        if compiled:
+            for opcode, handler in compile_handlers(self._read, self._write, self._buffer).items():
+                opcode_table[opcode] = MethodType(handler, self)
 
-        return opcode_table
+        return [handler or self.unhandled_opcode for handler in opcode_table]
 
     def step(self) -> StepResult:
         """Step one CPU tick.
 
         This function executes the next CPU instruction.
         """
-        opcode = self.memory.read(self.pc)
-        if opcode not in self.opcodes:
-            logger.warning(f"Unhandled opcode at ${self.pc:04x}")
-        self.pc += 1
-        handler = self.opcodes.get(opcode, self.brk)
+        pc = self.pc
+        handler = self._decode_cache[pc]
+        if handler is None:
+            handler = self._decode_cache[pc] = self.opcodes[self._read(pc)]
+        self.pc = pc + 1
         handler()
 
-        if self.status & (1 << self.STATUS_I) > 0 and self.status & (1 << self.STATUS_B) > 0:
-            self.status &= ~(1 << self.STATUS_B)
+        if self._brk_pending:
+            self._brk_pending = False
             return StepResult.BRK
         return StepResult.NORMAL
 
-    def update_zero_flag(self, result: int) -> None:
-        """Update the zero (Z) flag of the status register based on the result of an operation.
+    def invalidate_decode_cache(self, start: int = 0, stop: int = 0x10000) -> None:
+        """Forget the decoded instructions in an address range.
+
+        Writes performed by the CPU itself invalidate the affected addresses automatically. This method has to be
+        called when program code in memory is modified from outside of the CPU after it has been executed. Compiled
+        basic blocks that overlap the range are forgotten as well.
 
         Args:
-            result: Byte resulting from an operation that updates the status register.
+            start: First address of the range.
+            stop: Address after the last address of the range.
 
         """
-        self.status &= ~(1 << self.STATUS_Z)
-        self.status |= (result == 0) << self.STATUS_Z
+        self._decode_cache[start:stop] = [None] * (stop - start)
+        if any(self._block_code[start:stop]):
+            self._invalidate_blocks()
 
-    def update_overflow_flag(self, a_initial: int, operand: int, result: int) -> None:
-        """Update the overflow (V) flag of the status register based on the result of an operation.
+    def step_block(self) -> tuple[StepResult, int]:
+        """Execute the basic block of instructions starting at the program counter.
 
-        Args:
-            a_initial: Accumulator value before operation.
-            operand: Operand of potentially overflowing operation.
-            result: Accumulator value after operation.
+        The block is compiled into a Python function once its first address has been executed
+        `BLOCK_COMPILE_THRESHOLD` times, see `another6502.codegen`. Compiling takes as long as executing hundreds of
+        instructions, so code that runs only a few times, e.g., initialization, is executed one instruction at a time
+        with `step`, just like instructions that cannot be compiled, e.g., BRK.
+
+        Returns:
+            (result, n_instructions): Result of the last executed instruction and number of executed instructions.
 
         """
-        inputs_same_sign = ~(a_initial ^ operand) & 0x80
-        result_sign_different_from_inputs = (a_initial ^ result) & 0x80
-        v = inputs_same_sign & result_sign_different_from_inputs
-        v = (v >> 7) & 1
+        pc = self.pc
+        try:
+            block = self._block_cache[pc]
+        except KeyError:
+            heat = self._block_heat.get(pc, 0) + 1
+            if heat < self.BLOCK_COMPILE_THRESHOLD:
+                self._block_heat[pc] = heat
+                return self.step(), 1
+            block = self._block_cache[pc] = self._compile_block(pc)
+
+        if block is None:
+            return self.step(), 1
+        block.function(self)
+        return StepResult.NORMAL, block.n_instructions
+
+    def run_cycles(self, n_cycles: int) -> tuple[StepResult, int]:
+        """Execute basic blocks until at least a number of cycles has passed or BRK is executed.
+
+        At least one block is executed, see `step_block`. Looping here saves callers their bookkeeping after each block.
 
-        self.status &= ~(1 << self.STATUS_V)
-        self.status |= v << self.STATUS_V
+        Args:
+            n_cycles: Number of cycles to execute at least.
+
+        Returns:
+            (result, n_instructions): Result of the last executed instruction and number of executed instructions.
 
-    def update_negative_flag(self, result: int) -> None:
-        """Update the negative (N) flag of the status register based on the result of an operation.
+        """
+        target = self.cycles + n_cycles
+        step_block = self.step_block
+        n_instructions = 0
+        while True:
+            result, n = step_block()
+            n_instructions += n
+            if result is StepResult.BRK or self.cycles >= target:
+                return result, n_instructions
+
+    def _compile_block(self, start: int) -> CompiledBlock | None:
+        """Compile the basic block starting at an address and mark its code."""
+        block = compile_block(self._read, self._write, start, self._buffer, self._page_buffers)
+        if block is not None:
+            self._block_code[block.start:block.stop] = b"\x01" * (block.stop - block.start)
+        return block
+
+    def _invalidate_blocks(self) -> None:
+        """Forget all compiled basic blocks."""
+        self._block_cache.clear()
+        self._block_code[:] = bytes(0x10000)
+
+    def _write(self, address: int, value: int) -> None:
+        """Write a byte to memory and forget the instructions decoded and compiled at that address."""
+        self._memory_write(address, value)
+        self._decode_cache[address] = None
+        if self._block_code[address]:
+            self._invalidate_blocks()
+
+    def unhandled_opcode(self) -> None:
+        """Log opcodes without an implementation and treat them like BRK."""
+        logger.warning(f"Unhandled opcode at ${self.pc - 1:04x}")
+        self.brk()
+
+    def update_nz_flags(self, result: int) -> None:
+        """Update the negative (N) and zero (Z) flags of the status register based on the result of an operation.
 
         Args:
             result: Byte resulting from an operation that updates the status register.
 
         """
-        result_msb = (result >> 7) & 0x01
-        self.status &= ~(1 << self.STATUS_N)
-        self.status |= result_msb << self.STATUS_N
+        self.status = (self.status & ~self.NZ_MASK) | NZ_FLAGS[result]
 
-    def resolve_address(self, mode: AddressingMode) -> tuple[int, bool]:  # noqa: PLR0915
+    def resolve_address(self, mode: AddressingMode) -> tuple[int, int]:
         """Resolve the effective address for a given addressing mode.
 
         Args:
             mode: The addressing mode to resolve.
 
         Returns:
-            (addr, page_boundary_crossed): The effective memory address and if a page boundary
-            has been crossed by indexing.
+            (addr, page_boundary_crossed): The effective memory address and 1 if a page boundary
+            has been crossed by indexing, 0 otherwise.
 
         """
-        addr: int
-        page_boundary_crossed = False
-        match mode:
-            case AddressingMode.IMMEDIATE:
-                addr = self.pc
-                self.pc += 1
-            case AddressingMode.ZERO_PAGE:
-                addr = self.memory.read(self.pc)
-                self.pc += 1
-            case AddressingMode.ZERO_PAGE_X:
-                zero_page_location = self.memory.read(self.pc)
-                addr = (zero_page_location + self.x) & 0xff
-                self.pc += 1
-            case AddressingMode.ZERO_PAGE_Y:
-                zero_page_location = self.memory.read(self.pc)
-                addr = (zero_page_location + self.y) & 0xff
-                self.pc += 1
-            case AddressingMode.ABSOLUTE:
-                addr_base_lo = self.memory.read(self.pc)
-                addr_base_hi = self.memory.read(self.pc + 1)
-                addr = (addr_base_hi << 8) | addr_base_lo
-                self.pc += 2
-            case AddressingMode.ABSOLUTE_X:
-                addr_base_lo = self.memory.read(self.pc)
-                addr_base_hi = self.memory.read(self.pc + 1)
-                addr_base = (addr_base_hi << 8) | addr_base_lo
-                addr = (addr_base + self.x) & 0xffff
-                page_boundary_crossed = (addr_base & 0xff00) != (addr & 0xff00)
-                self.pc += 2
-            case AddressingMode.ABSOLUTE_Y:
-                addr_base_lo = self.memory.read(self.pc)
-                addr_base_hi = self.memory.read(self.pc + 1)
-                addr_base = (addr_base_hi << 8) | addr_base_lo
-                addr = (addr_base + self.y) & 0xffff
-                page_boundary_crossed = (addr_base & 0xff00) != (addr & 0xff00)
-                self.pc += 2
-            case AddressingMode.INDIRECT_X:
-                addr_zp = (self.memory.read(self.pc) + self.x) & 0xff
-                addr_indirect_lo = self.memory.read(addr_zp)
-                addr_indirect_hi = self.memory.read((addr_zp + 1) & 0xff)
-                addr = (addr_indirect_hi << 8) | addr_indirect_lo
-                self.pc += 1
-            case AddressingMode.INDIRECT_Y:
-                addr_zp = self.memory.read(self.pc)
-                addr_base_lo = self.memory.read(addr_zp)
-                addr_base_hi = self.memory.read((addr_zp + 1) & 0xff)
-                addr_base = (addr_base_hi << 8) | addr_base_lo
-                addr = (addr_base + self.y) & 0xffff
-                page_boundary_crossed = (addr_base & 0xff00) != (addr & 0xff00)
-                self.pc += 1
-            case _:
-                assert_never(mode)
-
-        return addr, page_boundary_crossed
+        return self.ADDRESS_RESOLVERS[mode](self)
+
+    def _resolve_immediate(self) -> tuple[int, int]:
+        """Resolve the address of an immediate operand."""
+        addr = self.pc
+        self.pc += 1
+        return addr, 0
+
+    def _resolve_zero_page(self) -> tuple[int, int]:
+        """Resolve an address in zero page addressing mode."""
+        addr = self._read(self.pc)
+        self.pc += 1
+        return addr, 0
+
+    def _resolve_zero_page_x(self) -> tuple[int, int]:
+        """Resolve an address in zero page,X addressing mode."""
+        addr = (self._read(self.pc) + self.x) & 0xff
+        self.pc += 1
+        return addr, 0
+
+    def _resolve_zero_page_y(self) -> tuple[int, int]:
+        """Resolve an address in zero page,Y addressing mode."""
+        addr = (self._read(self.pc) + self.y) & 0xff
+        self.pc += 1
+        return addr, 0
+
+    def _resolve_absolute(self) -> tuple[int, int]:
+        """Resolve an address in absolute addressing mode."""
+        read = self._read
+        pc = self.pc
+        self.pc = pc + 2
+        return read(pc) | (read(pc + 1) << 8), 0
+
+    def _resolve_absolute_x(self) -> tuple[int, int]:
+        """Resolve an address in absolute,X addressing mode."""
+        read = self._read
+        pc = self.pc
+        lo = read(pc)
+        index = self.x
+        addr = ((read(pc + 1) << 8 | lo) + index) & 0xffff
+        self.pc = pc + 2
+        return addr, (lo + index) >> 8
+
+    def _resolve_absolute_y(self) -> tuple[int, int]:
+        """Resolve an address in absolute,Y addressing mode."""
+        read = self._read
+        pc = self.pc
+        lo = read(pc)
+        index = self.y
+        addr = ((read(pc + 1) << 8 | lo) + index) & 0xffff
+        self.pc = pc + 2
+        return addr, (lo + index) >> 8
+
+    def _resolve_indirect_x(self) -> tuple[int, int]:
+        """Resolve an address in (indirect,X) addressing mode."""
+        read = self._read
+        addr_zp = (read(self.pc) + self.x) & 0xff
+        self.pc += 1
+        return read(addr_zp) | (read((addr_zp + 1) & 0xff) << 8), 0
+
+    def _resolve_indirect_y(self) -> tuple[int, int]:
+        """Resolve an address in (indirect),Y addressing mode."""
+        read = self._read
+        addr_zp = read(self.pc)
+        lo = read(addr_zp)
+        index = self.y
+        addr = ((read((addr_zp + 1) & 0xff) << 8 | lo) + index) & 0xffff
+        self.pc += 1
+        return addr, (lo + index) >> 8
+
+    ADDRESS_RESOLVERS: ClassVar[tuple[Callable[["CPU6502"], tuple[int, int]], ...]] = (
+        _resolve_immediate,
+        _resolve_zero_page,
+        _resolve_zero_page_x,
+        _resolve_zero_page_y,
+        _resolve_absolute,
+        _resolve_absolute_x,
+        _resolve_absolute_y,
+        _resolve_indirect_x,
+        _resolve_indirect_y,
+    )
+    """Address resolution for each addressing mode, indexed by the value of the mode."""
 
     def push_byte_to_stack(self, byte: int) -> None:
         """Push a byte to the stack and update stack pointer.
@@ -296,7 +450,7 @@ class CPU6502:
             byte: Byte to push onto the stack.
 
         """
-        self.memory.write(self.STACK_ROOT + self.sp, byte)
+        self._write(self.STACK_ROOT + self.sp, byte)
         self.sp = (self.sp - 1) & 0xff
 
     def pull_byte_from_stack(self) -> int:
@@ -308,8 +462,10 @@ class CPU6502:
             byte: Byte pulled from the stack.
 
         """
-        self.sp = (self.sp + 1) & 0xff
-        return self.memory.read(self.STACK_ROOT + self.sp)
+        sp = self.sp = (self.sp + 1) & 0xff
+        if self._stack is not None:
+            return self._stack[sp]
+        return self._read(self.STACK_ROOT + sp)
 
     def _interrupt(self, interrupt_type: Literal["maskable", "non-maskable", "break"]) -> None:
         """Initiate an interrupt.
@@ -322,15 +478,18 @@ class CPU6502:
             if interrupt_disable_flag:
                 return
 
+        # the B flag only exists in the copy of the status register on the stack
+        status_to_push = self.status
         if interrupt_type == "break":
-            self.status |= (1 << self.STATUS_B)
+            status_to_push |= (1 << self.STATUS_B)
+            self._brk_pending = True
 
         self.cycles += 7
         pc_lo = self.pc & 0xff
         pc_hi = (self.pc >> 8) & 0xff
         self.push_byte_to_stack(pc_hi)
         self.push_byte_to_stack(pc_lo)
-        self.push_byte_to_stack(self.status)
+        self.push_byte_to_stack(status_to_push)
 
         self.status |= (1 << self.STATUS_I)
 
@@ -338,8 +497,8 @@ class CPU6502:
         if interrupt_type == "non-maskable":
             vector = self.NMI_VECTOR
 
-        isr_lo = self.memory.read(vector)
-        isr_hi = self.memory.read(vector + 1)
+        isr_lo = self._read(vector)
+        isr_hi = self._read(vector + 1)
         self.pc = (isr_hi << 8) | isr_lo
 
     def irq(self) -> None:
@@ -368,24 +527,16 @@ class CPU6502:
             flag_value: The value the flag should have for the branch to be taken (0 or 1).
 
         """
-        int8_min = 0x80
-        should_branch = ((self.status >> flag_index) & 1) == flag_value
-        if should_branch:
-            offset = self.memory.read(self.pc)
-            self.pc += 1
+        if ((self.status >> flag_index) & 1) == flag_value:
+            offset = self._read(self.pc)
+            pc = self.pc + 1
 
-            # convert negative offsets to signed values
-            if offset >= int8_min:
-                offset -= 0x100
+            # sign extend the offset without branching, bit 7 counts -128 instead of +128
+            target = (pc + offset - ((offset & 0x80) << 1)) & 0xffff
+            self.pc = target
 
-            # jump
-            old_pc = self.pc
-            self.pc = (self.pc + offset) & 0xffff
-            self.cycles += 3
-
-            # add another cycle if page boundary is crossed
-            if (old_pc & 0xff00) != (self.pc & 0xff00):
-                self.cycles += 1
+            # add another cycle if a page boundary is crossed
+            self.cycles += 3 + ((pc ^ target) > 0xff)  # noqa: PLR2004
         else:
             self.pc += 1
             self.cycles += 2
@@ -404,17 +555,17 @@ class CPU6502:
         Note: This implementation correctly reproduces the hardware bug of the original NMOS 6502 in which the high byte
         of the target address is fetched from the beginning of the same page when the low byte is 0xff.
         """
-        addr_lo = self.memory.read(self.pc)
-        addr_hi = self.memory.read((self.pc + 1) & 0xffff)
+        addr_lo = self._read(self.pc)
+        addr_hi = self._read((self.pc + 1) & 0xffff)
         addr = (addr_hi << 8) | addr_lo
 
         if mode == "absolute":
             self.pc = addr
         elif mode == "indirect":
-            addr_lo = self.memory.read(addr)
+            addr_lo = self._read(addr)
             # this reproduces the NMOS 6502's hardware bug
             addr_incremented = (addr & 0xff00) | ((addr + 1) & 0x00ff)
-            addr_hi = self.memory.read(addr_incremented)
+            addr_hi = self._read(addr_incremented)
             self.pc = (addr_hi << 8) | addr_lo
         else:
             msg = f"Invalid mode {mode} for jmp."
@@ -425,8 +576,8 @@ class CPU6502:
     @opcode(0x20)
     def jsr(self) -> None:
         """Execute the Jump to SubRoutine (JSR) instruction."""
-        sr_addr_lo = self.memory.read(self.pc)
-        sr_addr_hi = self.memory.read((self.pc + 1) & 0xffff)
+        sr_addr_lo = self._read(self.pc)
+        sr_addr_hi = self._read((self.pc + 1) & 0xffff)
         sr_addr = (sr_addr_hi << 8) | sr_addr_lo
 
         # point to last byte of jsr instruction
@@ -453,7 +604,7 @@ class CPU6502:
         rt_hi = self.pull_byte_from_stack()
         rt = (rt_hi << 8) | rt_lo
         self.pc = rt
-        self.status = recovered_status
+        self.status = recovered_status & ~(1 << self.STATUS_B)
         self.cycles += 6
 
     @opcode(0x60)
@@ -511,27 +662,120 @@ class CPU6502:
 
     # Register loading
 
-    @opcode(0xa9, mode=AddressingMode.IMMEDIATE)
-    @opcode(0xa5, mode=AddressingMode.ZERO_PAGE)
-    @opcode(0xb5, mode=AddressingMode.ZERO_PAGE_X)
-    @opcode(0xad, mode=AddressingMode.ABSOLUTE)
-    @opcode(0xbd, mode=AddressingMode.ABSOLUTE_X)
-    @opcode(0xb9, mode=AddressingMode.ABSOLUTE_Y)
-    @opcode(0xa1, mode=AddressingMode.INDIRECT_X)
-    @opcode(0xb1, mode=AddressingMode.INDIRECT_Y)
     def lda(self, mode: AddressingMode) -> None:
         """Execute LDA instruction with specified addressing mode."""
-        # load value into register
-        addr, page_boundary_crossed = self.resolve_address(mode)
-        self.a = self.memory.read(addr)
+        self.LDA_HANDLERS[mode](self)
 
-        # update cycle counter
-        self.cycles += self.LOAD_CYCLE_COUNTS[mode]
-        if page_boundary_crossed and mode in self.LOAD_EXTRA_CYCLE_MODES:
-            self.cycles += 1
+    @opcode(0xa9)
+    def _lda_immediate(self) -> None:
+        """Execute LDA instruction in immediate addressing mode."""
+        self.a = self._read(self.pc)
+        self.pc += 1
+        self.cycles += 2
+        self.update_nz_flags(self.a)
 
-        self.update_zero_flag(self.a)
-        self.update_negative_flag(self.a)
+    @opcode(0xa5)
+    def _lda_zero_page(self) -> None:
+        """Execute LDA instruction in zero page addressing mode."""
+        read = self._read
+        addr = read(self.pc)
+        self.pc += 1
+        self.a = read(addr)
+        self.cycles += 3
+        self.update_nz_flags(self.a)
+
+    @opcode(0xb5)
+    def _lda_zero_page_x(self) -> None:
+        """Execute LDA instruction in zero page,X addressing mode."""
+        read = self._read
+        addr = (read(self.pc) + self.x) & 0xff
+        self.pc += 1
+        self.a = read(addr)
+        self.cycles += 4
+        self.update_nz_flags(self.a)
+
+    @opcode(0xad)
+    def _lda_absolute(self) -> None:
+        """Execute LDA instruction in absolute addressing mode."""
+        read = self._read
+        pc = self.pc
+        addr_lo = read(pc)
+        addr_hi = read(pc + 1)
+        self.pc += 2
+        self.a = read((addr_hi << 8) | addr_lo)
+        self.cycles += 4
+        self.update_nz_flags(self.a)
+
+    @opcode(0xbd)
+    def _lda_absolute_x(self) -> None:
+        """Execute LDA instruction in absolute,X addressing mode."""
+        read = self._read
+        pc = self.pc
+        addr_base_lo = read(pc)
+        addr_base_hi = read(pc + 1)
+        addr_base = (addr_base_hi << 8) | addr_base_lo
+        index = self.x
+        addr = (addr_base + index) & 0xffff
+        self.pc += 2
+        self.a = read(addr)
+        self.cycles += 4 + ((addr_base_lo + index) >> 8)
+        self.update_nz_flags(self.a)
+
+    @opcode(0xb9)
+    def _lda_absolute_y(self) -> None:
+        """Execute LDA instruction in absolute,Y addressing mode."""
+        read = self._read
+        pc = self.pc
+        addr_base_lo = read(pc)
+        addr_base_hi = read(pc + 1)
+        addr_base = (addr_base_hi << 8) | addr_base_lo
+        index = self.y
+        addr = (addr_base + index) & 0xffff
+        self.pc += 2
+        self.a = read(addr)
+        self.cycles += 4 + ((addr_base_lo + index) >> 8)
+        self.update_nz_flags(self.a)
+
+    @opcode(0xa1)
+    def _lda_indirect_x(self) -> None:
+        """Execute LDA instruction in (indirect,X) addressing mode."""
+        read = self._read
+        pc = self.pc
+        addr_zp = (read(pc) + self.x) & 0xff
+        addr_lo = read(addr_zp)
+        addr_hi = read((addr_zp + 1) & 0xff)
+        self.pc += 1
+        self.a = read((addr_hi << 8) | addr_lo)
+        self.cycles += 6
+        self.update_nz_flags(self.a)
+
+    @opcode(0xb1)
+    def _lda_indirect_y(self) -> None:
+        """Execute LDA instruction in (indirect),Y addressing mode."""
+        read = self._read
+        pc = self.pc
+        addr_zp = read(pc)
+        addr_base_lo = read(addr_zp)
+        addr_base_hi = read((addr_zp + 1) & 0xff)
+        addr_base = (addr_base_hi << 8) | addr_base_lo
+        index = self.y
+        addr = (addr_base + index) & 0xffff
+        self.pc += 1
+        self.a = read(addr)
+        self.cycles += 5 + ((addr_base_lo + index) >> 8)
+        self.update_nz_flags(self.a)
+
+    LDA_HANDLERS: ClassVar[dict[AddressingMode, Callable[["CPU6502"], None]]] = {
+        AddressingMode.IMMEDIATE: _lda_immediate,
+        AddressingMode.ZERO_PAGE: _lda_zero_page,
+        AddressingMode.ZERO_PAGE_X: _lda_zero_page_x,
+        AddressingMode.ABSOLUTE: _lda_absolute,
+        AddressingMode.ABSOLUTE_X: _lda_absolute_x,
+        AddressingMode.ABSOLUTE_Y: _lda_absolute_y,
+        AddressingMode.INDIRECT_X: _lda_indirect_x,
+        AddressingMode.INDIRECT_Y: _lda_indirect_y,
+    }
+    """Specialized LDA implementations for each addressing mode."""
 
     @opcode(0xa2, mode=AddressingMode.IMMEDIATE)
     @opcode(0xa6, mode=AddressingMode.ZERO_PAGE)
@@ -542,15 +786,12 @@ class CPU6502:
         """Execute LDX instruction with specified addressing mode."""
         # load value into register
         addr, page_boundary_crossed = self.resolve_address(mode)
-        self.x = self.memory.read(addr)
+        self.x = self._read(addr)
 
         # update cycle counter
-        self.cycles += self.LOAD_CYCLE_COUNTS[mode]
-        if page_boundary_crossed and mode in self.LOAD_EXTRA_CYCLE_MODES:
-            self.cycles += 1
+        self.cycles += self.LOAD_CYCLE_COUNTS[mode] + (page_boundary_crossed & (self.LOAD_EXTRA_CYCLE_MASK >> mode))
 
-        self.update_zero_flag(self.x)
-        self.update_negative_flag(self.x)
+        self.update_nz_flags(self.x)
 
     @opcode(0xa0, mode=AddressingMode.IMMEDIATE)
     @opcode(0xa4, mode=AddressingMode.ZERO_PAGE)
@@ -561,15 +802,12 @@ class CPU6502:
         """Execute LDY instruction with specified addressing mode."""
         # load value into register
         addr, page_boundary_crossed = self.resolve_address(mode)
-        self.y = self.memory.read(addr)
+        self.y = self._read(addr)
 
         # update cycle counter
-        self.cycles += self.LOAD_CYCLE_COUNTS[mode]
-        if page_boundary_crossed and mode in self.LOAD_EXTRA_CYCLE_MODES:
-            self.cycles += 1
+        self.cycles += self.LOAD_CYCLE_COUNTS[mode] + (page_boundary_crossed & (self.LOAD_EXTRA_CYCLE_MASK >> mode))
 
-        self.update_zero_flag(self.y)
-        self.update_negative_flag(self.y)
+        self.update_nz_flags(self.y)
 
     # Register storing
 
@@ -584,7 +822,7 @@ class CPU6502:
         """Execute the STore A (STA) instruction."""
         # write register value to memory
         addr, _ = self.resolve_address(mode)
-        self.memory.write(addr, self.a)
+        self._write(addr, self.a)
         self.cycles += self.STORE_CYCLE_COUNTS[mode]
 
     @opcode(0x86, mode=AddressingMode.ZERO_PAGE)
@@ -594,7 +832,7 @@ class CPU6502:
         """Execute the STore X (STX) instruction."""
         # write register value to memory
         addr, _ = self.resolve_address(mode)
-        self.memory.write(addr, self.x)
+        self._write(addr, self.x)
         self.cycles += self.STORE_CYCLE_COUNTS[mode]
 
     @opcode(0x84, mode=AddressingMode.ZERO_PAGE)
@@ -604,7 +842,7 @@ class CPU6502:
         """Execute the STore Y (STY) instruction."""
         # write register value to memory
         addr, _ = self.resolve_address(mode)
-        self.memory.write(addr, self.y)
+        self._write(addr, self.y)
         self.cycles += self.STORE_CYCLE_COUNTS[mode]
 
     # Register transfer
@@ -614,32 +852,28 @@ class CPU6502:
         """Execute the Transfer Accumulator to X (TAX) instruction."""
         self.x = self.a
         self.cycles += 2
-        self.update_zero_flag(self.x)
-        self.update_negative_flag(self.x)
+        self.update_nz_flags(self.x)
 
     @opcode(0xa8)
     def tay(self) -> None:
         """Execute the Transfer Accumulator to Y (TAY) instruction."""
         self.y = self.a
         self.cycles += 2
-        self.update_zero_flag(self.y)
-        self.update_negative_flag(self.y)
+        self.update_nz_flags(self.y)
 
     @opcode(0xba)
     def tsx(self) -> None:
         """Execute the Transfer Stack Pointer to X (TSX) instruction."""
         self.x = self.sp
         self.cycles += 2
-        self.update_zero_flag(self.x)
-        self.update_negative_flag(self.x)
+        self.update_nz_flags(self.x)
 
     @opcode(0x8a)
     def txa(self) -> None:
         """Execute the Transfer X to Accumulator (TXA) instruction."""
         self.a = self.x
         self.cycles += 2
-        self.update_zero_flag(self.a)
-        self.update_negative_flag(self.a)
+        self.update_nz_flags(self.a)
 
     @opcode(0x9a)
     def txs(self) -> None:
@@ -652,8 +886,7 @@ class CPU6502:
         """Execute the Transfer Y to Accumulator (TYA) instruction."""
         self.a = self.y
         self.cycles += 2
-        self.update_zero_flag(self.a)
-        self.update_negative_flag(self.a)
+        self.update_nz_flags(self.a)
 
     # Stack instructions
 
@@ -674,8 +907,7 @@ class CPU6502:
     def pla(self) -> None:
         """Execute the PuLl Accumulator (PLA) instruction."""
         self.a = self.pull_byte_from_stack()
-        self.update_negative_flag(self.a)
-        self.update_zero_flag(self.a)
+        self.update_nz_flags(self.a)
         self.cycles += 4
 
     @opcode(0x28)
@@ -695,14 +927,13 @@ class CPU6502:
     def dec(self, mode: AddressingMode) -> None:
         """Execute the DECrement (DEC) instruction."""
         addr, _ = self.resolve_address(mode)
-        byte = self.memory.read(addr)
+        byte = self._read(addr)
         byte = (byte - 1) & 0xff
-        self.memory.write(addr, byte)
+        self._write(addr, byte)
 
         self.cycles += self.UNARY_CYCLE_COUNTS[mode]
 
-        self.update_zero_flag(byte)
-        self.update_negative_flag(byte)
+        self.update_nz_flags(byte)
 
     @opcode(0xca)
     def dex(self) -> None:
@@ -711,8 +942,7 @@ class CPU6502:
 
         self.cycles += 2
 
-        self.update_zero_flag(self.x)
-        self.update_negative_flag(self.x)
+        self.update_nz_flags(self.x)
 
     @opcode(0x88)
     def dey(self) -> None:
@@ -721,8 +951,7 @@ class CPU6502:
 
         self.cycles += 2
 
-        self.update_zero_flag(self.y)
-        self.update_negative_flag(self.y)
+        self.update_nz_flags(self.y)
 
     @opcode(0xe6, mode=AddressingMode.ZERO_PAGE)
     @opcode(0xf6, mode=AddressingMode.ZERO_PAGE_X)
@@ -731,14 +960,13 @@ class CPU6502:
     def inc(self, mode: AddressingMode) -> None:
         """Execute the INCrement (INC) instruction."""
         addr, _ = self.resolve_address(mode)
-        byte = self.memory.read(addr)
+        byte = self._read(addr)
         byte = (byte + 1) & 0xff
-        self.memory.write(addr, byte)
+        self._write(addr, byte)
 
         self.cycles += self.UNARY_CYCLE_COUNTS[mode]
 
-        self.update_zero_flag(byte)
-        self.update_negative_flag(byte)
+        self.update_nz_flags(byte)
 
     @opcode(0xe8)
     def inx(self) -> None:
@@ -747,8 +975,7 @@ class CPU6502:
 
         self.cycles += 2
 
-        self.update_zero_flag(self.x)
-        self.update_negative_flag(self.x)
+        self.update_nz_flags(self.x)
 
     @opcode(0xc8)
     def iny(self) -> None:
@@ -757,8 +984,7 @@ class CPU6502:
 
         self.cycles += 2
 
-        self.update_zero_flag(self.y)
-        self.update_negative_flag(self.y)
+        self.update_nz_flags(self.y)
 
     @opcode(0x0a)
     @opcode(0x06, mode=AddressingMode.ZERO_PAGE)
@@ -770,31 +996,20 @@ class CPU6502:
 
         If `mode` is None, ASL is performed on the accumulator.
         """
-        value: int
-        carry: int
-        if mode:
-            addr, _ = self.resolve_address(mode)
-            value = self.memory.read(addr)
+        addr = self.resolve_address(mode)[0] if mode is not None else None
+        value = self.a if addr is None else self._read(addr)
 
-            carry = (value >> 7) & 1
-            value = (value << 1) & 0xff
-
-            self.memory.write(addr, value)
-        else:
-            value = self.a
-
-            carry = (value >> 7) & 1
-            value = (value << 1) & 0xff
+        carry = value >> 7
+        value = (value << 1) & 0xff
 
+        if addr is None:
             self.a = value
+        else:
+            self._write(addr, value)
 
-        self.status &= ~(1 << self.STATUS_C)
-        self.status |= (carry << self.STATUS_C)
-
-        self.cycles += self.UNARY_CYCLE_COUNTS[mode] if mode else 2
+        self.status = (self.status & ~self.NZC_MASK) | carry | NZ_FLAGS[value]
 
-        self.update_zero_flag(value)
-        self.update_negative_flag(value)
+        self.cycles += self.UNARY_CYCLE_COUNTS[mode] if mode is not None else 2
 
     @opcode(0x4a)
     @opcode(0x46, mode=AddressingMode.ZERO_PAGE)
@@ -806,105 +1021,76 @@ class CPU6502:
 
         If `mode` is None, LSR is performed on the accumulator.
         """
-        value: int
-        carry: int
-        if mode:
-            addr, _ = self.resolve_address(mode)
-            value = self.memory.read(addr)
+        addr = self.resolve_address(mode)[0] if mode is not None else None
+        value = self.a if addr is None else self._read(addr)
 
-            carry = value & 1
-            value >>= 1
-
-            self.memory.write(addr, value)
-        else:
-            value = self.a
-
-            carry = value & 1
-            value >>= 1
+        carry = value & 1
+        value >>= 1
 
+        if addr is None:
             self.a = value
+        else:
+            self._write(addr, value)
 
-        self.status &= ~(1 << self.STATUS_C)
-        self.status |= (carry << self.STATUS_C)
-
-        self.cycles += self.UNARY_CYCLE_COUNTS[mode] if mode else 2
+        self.status = (self.status & ~self.NZC_MASK) | carry | NZ_FLAGS[value]
 
-        self.update_zero_flag(value)
-        self.update_negative_flag(value)  # Always zero here
+        self.cycles += self.UNARY_CYCLE_COUNTS[mode] if mode is not None else 2
 
     @opcode(0x2a)
     @opcode(0x26, mode=AddressingMode.ZERO_PAGE)
     @opcode(0x36, mode=AddressingMode.ZERO_PAGE_X)
     @opcode(0x2e, mode=AddressingMode.ABSOLUTE)
     @opcode(0x3e, mode=AddressingMode.ABSOLUTE_X)
-    def rol(self, mode: AddressingMode | None) -> None:
+    def rol(self, mode: AddressingMode | None = None) -> None:
         """Execute the Rotate Left (ROL) instruction.
 
         If `mode` is None, ROL is performed on the accumulator.
         """
-        buffer = (self.status >> self.STATUS_C) & 1
-        value: int
-        carry: int
-        if mode:
-            addr, _ = self.resolve_address(mode)
-            value = self.memory.read(addr)
+        status = self.status
+        buffer = status & 1
 
-            carry = (value >> 7) & 1
-            value = (value << 1 | buffer) & 0xff
+        addr = self.resolve_address(mode)[0] if mode is not None else None
+        value = self.a if addr is None else self._read(addr)
 
-            self.memory.write(addr, value)
-        else:
-            value = self.a
-
-            carry = (value >> 7) & 1
-            value = (value << 1 | buffer) & 0xff
+        carry = value >> 7
+        value = (value << 1 | buffer) & 0xff
 
+        if addr is None:
             self.a = value
+        else:
+            self._write(addr, value)
 
-        self.status &= ~(1 << self.STATUS_C)
-        self.status |= (carry << self.STATUS_C)
-
-        self.cycles += self.UNARY_CYCLE_COUNTS[mode] if mode else 2
+        self.status = (status & ~self.NZC_MASK) | carry | NZ_FLAGS[value]
 
-        self.update_zero_flag(value)
-        self.update_negative_flag(value)
+        self.cycles += self.UNARY_CYCLE_COUNTS[mode] if mode is not None else 2
 
     @opcode(0x6a)
     @opcode(0x66, mode=AddressingMode.ZERO_PAGE)
     @opcode(0x76, mode=AddressingMode.ZERO_PAGE_X)
     @opcode(0x6e, mode=AddressingMode.ABSOLUTE)
     @opcode(0x7e, mode=AddressingMode.ABSOLUTE_X)
-    def ror(self, mode: AddressingMode | None) -> None:
+    def ror(self, mode: AddressingMode | None = None) -> None:
         """Execute the Rotate Right (ROR) instruction.
 
         If `mode` is None, ROR is performed on the accumulator.
         """
-        buffer = (self.status >> self.STATUS_C) & 1
-        value: int
-        carry: int
-        if mode:
-            addr, _ = self.resolve_address(mode)
-            value = self.memory.read(addr)
-
-            carry = value & 1
-            value = ((buffer << 8) | value) >> 1
+        status = self.status
+        buffer = status & 1
 
-            self.memory.write(addr, value)
-        else:
-            value = self.a
+        addr = self.resolve_address(mode)[0] if mode is not None else None
+        value = self.a if addr is None else self._read(addr)
 
-            carry = value & 1
-            value = ((buffer << 8) | value) >> 1
+        carry = value & 1
+        value = ((buffer << 8) | value) >> 1
 
+        if addr is None:
             self.a = value
+        else:
+            self._write(addr, value)
 
-        self.status &= ~(1 << self.STATUS_C)
-        self.status |= (carry << self.STATUS_C)
-
-        self.cycles += self.UNARY_CYCLE_COUNTS[mode] if mode else 2
+        self.status = (status & ~self.NZC_MASK) | carry | NZ_FLAGS[value]
 
-        self.update_zero_flag(value)
-        self.update_negative_flag(value)
+        self.cycles += self.UNARY_CYCLE_COUNTS[mode] if mode is not None else 2
 
     # Binary arithmetic
 
@@ -919,15 +1105,16 @@ class CPU6502:
     def adc(self, mode: AddressingMode) -> None:
         """Execute the ADd with Carry (ADC) instruction."""
         addr, page_boundary_crossed = self.resolve_address(mode)
-        operand = self.memory.read(addr)
+        operand = self._read(addr)
 
         a_initial = self.a
-        carry_in = (self.status >> self.STATUS_C) & 1
-        binary_intermediate_sum = self.a + operand + carry_in
+        status = self.status
+        carry_in = status & 1
+        binary_intermediate_sum = a_initial + operand + carry_in
         carry_out = binary_intermediate_sum >> 8
         binary_result = binary_intermediate_sum & 0xff
 
-        if (self.status & (1 << self.STATUS_D)) == 0:
+        if (status & (1 << self.STATUS_D)) == 0:
             self.a = binary_result
         else:
             lo_nibble_a = a_initial & 0xF
@@ -943,15 +1130,10 @@ class CPU6502:
             intermediate_sum = intermediate_sum - 100 if carry_out else intermediate_sum
             self.a = dec_to_bcd(intermediate_sum)
 
-        self.status &= ~(1 << self.STATUS_C)
-        self.status |= (carry_out << self.STATUS_C)
-        self.update_zero_flag(binary_result)
-        self.update_negative_flag(binary_result)
-        self.update_overflow_flag(a_initial, operand, binary_result)
+        overflow = ~(a_initial ^ operand) & (a_initial ^ binary_result) & 0x80
+        self.status = (status & ~self.NVZC_MASK) | carry_out | NZ_FLAGS[binary_result] | (overflow >> 1)
 
-        self.cycles += self.BINARY_CYCLE_COUNTS[mode]
-        if page_boundary_crossed and mode in (*self.BINARY_EXTRA_CYCLE_MODES, AddressingMode.INDIRECT_Y):
-            self.cycles += 1
+        self.cycles += self.BINARY_CYCLE_COUNTS[mode] + (page_boundary_crossed & (self.BINARY_EXTRA_CYCLE_MASK >> mode))
 
     @opcode(0x29, mode=AddressingMode.IMMEDIATE)
     @opcode(0x25, mode=AddressingMode.ZERO_PAGE)
@@ -964,16 +1146,13 @@ class CPU6502:
     def and_op(self, mode: AddressingMode) -> None:
         """Execute the AND instruction."""
         addr, page_boundary_crossed = self.resolve_address(mode)
-        operand = self.memory.read(addr)
+        operand = self._read(addr)
 
         self.a &= operand
 
-        self.update_zero_flag(self.a)
-        self.update_negative_flag(self.a)
+        self.update_nz_flags(self.a)
 
-        self.cycles += self.BINARY_CYCLE_COUNTS[mode]
-        if page_boundary_crossed and mode in (*self.BINARY_EXTRA_CYCLE_MODES, AddressingMode.INDIRECT_Y):
-            self.cycles += 1
+        self.cycles += self.BINARY_CYCLE_COUNTS[mode] + (page_boundary_crossed & (self.BINARY_EXTRA_CYCLE_MASK >> mode))
 
     @opcode(0x49, mode=AddressingMode.IMMEDIATE)
     @opcode(0x45, mode=AddressingMode.ZERO_PAGE)
@@ -986,16 +1165,13 @@ class CPU6502:
     def eor(self, mode: AddressingMode) -> None:
         """Execute the Exclusive OR instruction."""
         addr, page_boundary_crossed = self.resolve_address(mode)
-        operand = self.memory.read(addr)
+        operand = self._read(addr)
 
         self.a ^= operand
 
-        self.update_zero_flag(self.a)
-        self.update_negative_flag(self.a)
+        self.update_nz_flags(self.a)
 
-        self.cycles += self.BINARY_CYCLE_COUNTS[mode]
-        if page_boundary_crossed and mode in self.BINARY_EXTRA_CYCLE_MODES:
-            self.cycles += 1
+        self.cycles += self.BINARY_CYCLE_COUNTS[mode] + (page_boundary_crossed & (self.BINARY_EXTRA_CYCLE_MASK >> mode))
 
     @opcode(0x09, mode=AddressingMode.IMMEDIATE)
     @opcode(0x05, mode=AddressingMode.ZERO_PAGE)
@@ -1008,16 +1184,13 @@ class CPU6502:
     def ora(self, mode: AddressingMode) -> None:
         """Execute the OR with Accumulator instruction."""
         addr, page_boundary_crossed = self.resolve_address(mode)
-        operand = self.memory.read(addr)
+        operand = self._read(addr)
 
         self.a |= operand
 
-        self.update_zero_flag(self.a)
-        self.update_negative_flag(self.a)
+        self.update_nz_flags(self.a)
 
-        self.cycles += self.BINARY_CYCLE_COUNTS[mode]
-        if page_boundary_crossed and mode in self.BINARY_EXTRA_CYCLE_MODES:
-            self.cycles += 1
+        self.cycles += self.BINARY_CYCLE_COUNTS[mode] + (page_boundary_crossed & (self.BINARY_EXTRA_CYCLE_MASK >> mode))
 
     @opcode(0xe9, mode=AddressingMode.IMMEDIATE)
     @opcode(0xe5, mode=AddressingMode.ZERO_PAGE)
@@ -1030,15 +1203,16 @@ class CPU6502:
     def sbc(self, mode: AddressingMode) -> None:
         """Execute the SuBtract with Carry / borrow (SBC) instruction."""
         addr, page_boundary_crossed = self.resolve_address(mode)
-        operand = self.memory.read(addr)
+        operand = self._read(addr)
 
         a_initial = self.a
-        carry_in = (self.status >> self.STATUS_C) & 1
-        binary_intermediate_difference = self.a + (~operand & 0xff) + carry_in
+        status = self.status
+        carry_in = status & 1
+        binary_intermediate_difference = a_initial + (~operand & 0xff) + carry_in
         carry_out = binary_intermediate_difference >> 8
         binary_result = binary_intermediate_difference & 0xff
 
-        if (self.status & (1 << self.STATUS_D)) == 0:
+        if (status & (1 << self.STATUS_D)) == 0:
             self.a = binary_result
         else:
             lo_nibble_a = a_initial & 0xF
@@ -1054,15 +1228,10 @@ class CPU6502:
             intermediate_sum = intermediate_sum if carry_out else intermediate_sum + 100
             self.a = dec_to_bcd(intermediate_sum)
 
-        self.status &= ~(1 << self.STATUS_C)
-        self.status |= (carry_out << self.STATUS_C)
-        self.update_zero_flag(binary_result)
-        self.update_negative_flag(binary_result)
-        self.update_overflow_flag(a_initial, ~operand & 0xff, binary_result)
+        overflow = (a_initial ^ operand) & (a_initial ^ binary_result) & 0x80
+        self.status = (status & ~self.NVZC_MASK) | carry_out | NZ_FLAGS[binary_result] | (overflow >> 1)
 
-        self.cycles += self.BINARY_CYCLE_COUNTS[mode]
-        if page_boundary_crossed and mode in (*self.BINARY_EXTRA_CYCLE_MODES, AddressingMode.INDIRECT_Y):
-            self.cycles += 1
+        self.cycles += self.BINARY_CYCLE_COUNTS[mode] + (page_boundary_crossed & (self.BINARY_EXTRA_CYCLE_MASK >> mode))
 
     # Binary logic
 
@@ -1071,66 +1240,50 @@ class CPU6502:
     def bit(self, mode: AddressingMode) -> None:
         """Execute the BIT test (BIT) instruction."""
         addr, _ = self.resolve_address(mode)
-        operand = self.memory.read(addr)
+        operand = self._read(addr)
 
-        operand_bit_7 = (operand >> 7) & 1
-        operand_bit_6 = (operand >> 6) & 1
-        operand_mask_zero = 1 if operand & self.a == 0 else 0
-
-        self.status &= ~(1 << self.STATUS_N)
-        self.status &= ~(1 << self.STATUS_V)
-        self.status &= ~(1 << self.STATUS_Z)
-        self.status |= (operand_bit_7 << self.STATUS_N)
-        self.status |= (operand_bit_6 << self.STATUS_V)
-        self.status |= (operand_mask_zero << self.STATUS_Z)
+        self.status = (self.status & ~self.NVZ_MASK) | (operand & 0xc0) | (((operand & self.a) == 0) << self.STATUS_Z)
 
         self.cycles += self.BINARY_CYCLE_COUNTS[mode]
 
-    @opcode(0xc9, register="a", mode=AddressingMode.IMMEDIATE)
-    @opcode(0xc5, register="a", mode=AddressingMode.ZERO_PAGE)
-    @opcode(0xd5, register="a", mode=AddressingMode.ZERO_PAGE_X)
-    @opcode(0xcd, register="a", mode=AddressingMode.ABSOLUTE)
-    @opcode(0xdd, register="a", mode=AddressingMode.ABSOLUTE_X)
-    @opcode(0xd9, register="a", mode=AddressingMode.ABSOLUTE_Y)
-    @opcode(0xc1, register="a", mode=AddressingMode.INDIRECT_X)
-    @opcode(0xd1, register="a", mode=AddressingMode.INDIRECT_Y)
-    @opcode(0xe0, register="x", mode=AddressingMode.IMMEDIATE)
-    @opcode(0xe4, register="x", mode=AddressingMode.ZERO_PAGE)
-    @opcode(0xec, register="x", mode=AddressingMode.ABSOLUTE)
-    @opcode(0xc0, register="y", mode=AddressingMode.IMMEDIATE)
-    @opcode(0xc4, register="y", mode=AddressingMode.ZERO_PAGE)
-    @opcode(0xcc, register="y", mode=AddressingMode.ABSOLUTE)
-    def compare(self, register: Literal["a", "x", "y"], mode: AddressingMode) -> None:
-        """Execute the compare instruction (CMP, CPX, CPY)."""
-        if register == "a":
-            register_value = self.a
-        elif register == "x":
-            register_value = self.x
-        elif register == "y":
-            register_value = self.y
-        else:
-            msg = f"Invalid register '{register}'."
-            raise ValueError(msg)
-
-        self.compare_logic(register_value, mode)
+    @opcode(0xc9, mode=AddressingMode.IMMEDIATE)
+    @opcode(0xc5, mode=AddressingMode.ZERO_PAGE)
+    @opcode(0xd5, mode=AddressingMode.ZERO_PAGE_X)
+    @opcode(0xcd, mode=AddressingMode.ABSOLUTE)
+    @opcode(0xdd, mode=AddressingMode.ABSOLUTE_X)
+    @opcode(0xd9, mode=AddressingMode.ABSOLUTE_Y)
+    @opcode(0xc1, mode=AddressingMode.INDIRECT_X)
+    @opcode(0xd1, mode=AddressingMode.INDIRECT_Y)
+    def cmp(self, mode: AddressingMode) -> None:
+        """Execute the CoMPare accumulator (CMP) instruction."""
+        self.compare_logic(self.a, mode)
+
+    @opcode(0xe0, mode=AddressingMode.IMMEDIATE)
+    @opcode(0xe4, mode=AddressingMode.ZERO_PAGE)
+    @opcode(0xec, mode=AddressingMode.ABSOLUTE)
+    def cpx(self, mode: AddressingMode) -> None:
+        """Execute the ComPare X register (CPX) instruction."""
+        self.compare_logic(self.x, mode)
+
+    @opcode(0xc0, mode=AddressingMode.IMMEDIATE)
+    @opcode(0xc4, mode=AddressingMode.ZERO_PAGE)
+    @opcode(0xcc, mode=AddressingMode.ABSOLUTE)
+    def cpy(self, mode: AddressingMode) -> None:
+        """Execute the ComPare Y register (CPY) instruction."""
+        self.compare_logic(self.y, mode)
 
     def compare_logic(self, register_value: int, mode: AddressingMode) -> None:
         """Execute logic for comparison instructions and update registers and cycle counts."""
         addr, page_boundary_crossed = self.resolve_address(mode)
-        operand = self.memory.read(addr)
+        operand = self._read(addr)
 
         binary_intermediate_difference = register_value + (~operand & 0xff) + 1
         carry_out = (binary_intermediate_difference >> 8) & 1
         binary_result = binary_intermediate_difference & 0xff
 
-        self.status &= ~(1 << self.STATUS_C)
-        self.status |= (carry_out << self.STATUS_C)
-        self.update_zero_flag(binary_result)
-        self.update_negative_flag(binary_result)
+        self.status = (self.status & ~self.NZC_MASK) | carry_out | NZ_FLAGS[binary_result]
 
-        self.cycles += self.BINARY_CYCLE_COUNTS[mode]
-        if page_boundary_crossed and mode in (*self.BINARY_EXTRA_CYCLE_MODES, AddressingMode.INDIRECT_Y):
-            self.cycles += 1
+        self.cycles += self.BINARY_CYCLE_COUNTS[mode] + (page_boundary_crossed & (self.BINARY_EXTRA_CYCLE_MASK >> mode))
 
 
 def run(
@@ -1138,39 +1291,59 @@ def run(
     max_steps: int | None = 10_000,
     interrupt_hook: Callable[[CPU6502], None] | None = None,
     cycles_per_second: float | None = None,
+    wakeup: threading.Event | None = None,
 ) -> None:
     """Let a CPU run it's program.
 
+    The program is executed in basic blocks, see `CPU6502.run_cycles`. If the execution speed is limited, the interrupt
+    hook is only called, the emulation only synchronized with the wall clock and the maximum number of steps only
+    checked `TICKS_PER_SECOND` times per emulated second. Otherwise, this happens after each block.
+
     Args:
         cpu: CPU to let run.
         max_steps: Maximum number of instructions to execute. If set to None there is no limit on number of
         instructions.
         interrupt_hook: Hook to trigger interrupts in the CPU based on the state of, e.g., peripherals.
         cycles_per_second: Roughly limit program execution speed to the specified frequency.
+        wakeup: Event that peripherals set when they need the interrupt hook's attention, e.g., because input arrived.
+            Setting it interrupts the wait for the wall clock, so the hook is called after the next tick without delay.
 
     Raises:
         RuntimeError: When maximum number of steps is reached.
 
     """
     time_per_cycle = 1 / cycles_per_second if cycles_per_second is not None else 0
+    cycles_per_tick = max(1, int(cycles_per_second // TICKS_PER_SECOND)) if cycles_per_second is not None else 0
     steps = 0
-    cycles_at_last_sleep = 0
+    start_time = time.perf_counter()
+    start_cycles = cpu.cycles
+    # the hook is called after each block if the execution speed is not limited
+    advance = partial(cpu.run_cycles, cycles_per_tick) if cycles_per_second is not None else cpu.step_block
+    brk = StepResult.BRK
     while True:
-        result = cpu.step()
-        steps += 1
+        result, n_instructions = advance()
+        steps += n_instructions
 
-        if result == StepResult.BRK:
+        if result is brk:
             break
 
-        if interrupt_hook is not None:
-            interrupt_hook(cpu)
-
         if max_steps is not None:  # noqa: SIM102, doesn't work here
             if steps > max_steps:
                 msg = "Maximum number of steps reached."
                 raise RuntimeError(msg)
 
+        if interrupt_hook is not None:
+            interrupt_hook(cpu)
+
         if cycles_per_second is not None:
-            cycles_since_last_sleep = cpu.cycles - cycles_at_last_sleep
-            time.sleep(cycles_since_last_sleep * time_per_cycle)
-            cycles_at_last_sleep = cpu.cycles
+            delay = start_time + (cpu.cycles - start_cycles) * time_per_cycle - time.perf_counter()
+            if delay > 0:
+                _wait(delay, wakeup)
+
+
+def _wait(seconds: float, wakeup: threading.Event | None) -> None:
+    """Sleep unless the wakeup event is set in the meantime, in which case it is cleared."""
+    if wakeup is None:
+        time.sleep(seconds)
+    elif wakeup.wait(seconds):
+        wakeup.clear()
@@ -0,0 +1,202 @@
+"""Instruction set of the NMOS 6502."""
+
+import enum
+from dataclasses import dataclass
+
+
+class AddressingMode(enum.IntEnum):
+    """Addressing mode of a 6502 instruction.
+
+    The modes are plain integers, so comparing them and using them as keys is as cheap as it is for `int`.
+    """
+
+    IMMEDIATE = 0
+    ZERO_PAGE = 1
+    ZERO_PAGE_X = 2
+    ZERO_PAGE_Y = 3
+    ABSOLUTE = 4
+    ABSOLUTE_X = 5
+    ABSOLUTE_Y = 6
+    INDIRECT_X = 7
+    INDIRECT_Y = 8
+
+
+@dataclass(frozen=True)
+class Instruction:
+    """Static properties of an opcode."""
+
+    mnemonic: str
+    """Assembler mnemonic of the instruction, e.g., `LDA`."""
+
+    mode: AddressingMode | None
+    """Addressing mode of the operand, None for instructions that do not address memory through `resolve_address`."""
+
+    length: int
+    """Number of bytes of the instruction including the opcode."""
+
+    cycles: int
+    """Number of cycles the instruction takes at least."""
+
+    page_penalty: bool = False
+    """If the instruction takes an extra cycle when indexing crosses a page boundary."""
+
+
+INSTRUCTIONS: dict[int, Instruction] = {
+    0x61: Instruction("ADC", AddressingMode.INDIRECT_X, 2, 6),
+    0x65: Instruction("ADC", AddressingMode.ZERO_PAGE, 2, 3),
+    0x69: Instruction("ADC", AddressingMode.IMMEDIATE, 2, 2),
+    0x6d: Instruction("ADC", AddressingMode.ABSOLUTE, 3, 4),
+    0x71: Instruction("ADC", AddressingMode.INDIRECT_Y, 2, 5, page_penalty=True),
+    0x75: Instruction("ADC", AddressingMode.ZERO_PAGE_X, 2, 4),
+    0x79: Instruction("ADC", AddressingMode.ABSOLUTE_Y, 3, 4, page_penalty=True),
+    0x7d: Instruction("ADC", AddressingMode.ABSOLUTE_X, 3, 4, page_penalty=True),
+    0x21: Instruction("AND", AddressingMode.INDIRECT_X, 2, 6),
+    0x25: Instruction("AND", AddressingMode.ZERO_PAGE, 2, 3),
+    0x29: Instruction("AND", AddressingMode.IMMEDIATE, 2, 2),
+    0x2d: Instruction("AND", AddressingMode.ABSOLUTE, 3, 4),
+    0x31: Instruction("AND", AddressingMode.INDIRECT_Y, 2, 5, page_penalty=True),
+    0x35: Instruction("AND", AddressingMode.ZERO_PAGE_X, 2, 4),
+    0x39: Instruction("AND", AddressingMode.ABSOLUTE_Y, 3, 4, page_penalty=True),
+    0x3d: Instruction("AND", AddressingMode.ABSOLUTE_X, 3, 4, page_penalty=True),
+    0x06: Instruction("ASL", AddressingMode.ZERO_PAGE, 2, 5),
+    0x0a: Instruction("ASL", None, 1, 2),
+    0x0e: Instruction("ASL", AddressingMode.ABSOLUTE, 3, 6),
+    0x16: Instruction("ASL", AddressingMode.ZERO_PAGE_X, 2, 6),
+    0x1e: Instruction("ASL", AddressingMode.ABSOLUTE_X, 3, 7),
+    0x90: Instruction("BCC", None, 2, 2),
+    0xb0: Instruction("BCS", None, 2, 2),
+    0xf0: Instruction("BEQ", None, 2, 2),
+    0x24: Instruction("BIT", AddressingMode.ZERO_PAGE, 2, 3),
+    0x2c: Instruction("BIT", AddressingMode.ABSOLUTE, 3, 4),
+    0x30: Instruction("BMI", None, 2, 2),
+    0xd0: Instruction("BNE", None, 2, 2),
+    0x10: Instruction("BPL", None, 2, 2),
+    0x00: Instruction("BRK", None, 1, 7),
+    0x50: Instruction("BVC", None, 2, 2),
+    0x70: Instruction("BVS", None, 2, 2),
+    0x18: Instruction("CLC", None, 1, 2),
+    0xd8: Instruction("CLD", None, 1, 2),
+    0x58: Instruction("CLI", None, 1, 2),
+    0xb8: Instruction("CLV", None, 1, 2),
+    0xc1: Instruction("CMP", AddressingMode.INDIRECT_X, 2, 6),
+    0xc5: Instruction("CMP", AddressingMode.ZERO_PAGE, 2, 3),
+    0xc9: Instruction("CMP", AddressingMode.IMMEDIATE, 2, 2),
+    0xcd: Instruction("CMP", AddressingMode.ABSOLUTE, 3, 4),
+    0xd1: Instruction("CMP", AddressingMode.INDIRECT_Y, 2, 5, page_penalty=True),
+    0xd5: Instruction("CMP", AddressingMode.ZERO_PAGE_X, 2, 4),
+    0xd9: Instruction("CMP", AddressingMode.ABSOLUTE_Y, 3, 4, page_penalty=True),
+    0xdd: Instruction("CMP", AddressingMode.ABSOLUTE_X, 3, 4, page_penalty=True),
+    0xe0: Instruction("CPX", AddressingMode.IMMEDIATE, 2, 2),
+    0xe4: Instruction("CPX", AddressingMode.ZERO_PAGE, 2, 3),
+    0xec: Instruction("CPX", AddressingMode.ABSOLUTE, 3, 4),
+    0xc0: Instruction("CPY", AddressingMode.IMMEDIATE, 2, 2),
+    0xc4: Instruction("CPY", AddressingMode.ZERO_PAGE, 2, 3),
+    0xcc: Instruction("CPY", AddressingMode.ABSOLUTE, 3, 4),
+    0xc6: Instruction("DEC", AddressingMode.ZERO_PAGE, 2, 5),
+    0xce: Instruction("DEC", AddressingMode.ABSOLUTE, 3, 6),
+    0xd6: Instruction("DEC", AddressingMode.ZERO_PAGE_X, 2, 6),
+    0xde: Instruction("DEC", AddressingMode.ABSOLUTE_X, 3, 7),
+    0xca: Instruction("DEX", None, 1, 2),
+    0x88: Instruction("DEY", None, 1, 2),
+    0x41: Instruction("EOR", AddressingMode.INDIRECT_X, 2, 6),
+    0x45: Instruction("EOR", AddressingMode.ZERO_PAGE, 2, 3),
+    0x49: Instruction("EOR", AddressingMode.IMMEDIATE, 2, 2),
+    0x4d: Instruction("EOR", AddressingMode.ABSOLUTE, 3, 4),
+    0x51: Instruction("EOR", AddressingMode.INDIRECT_Y, 2, 5, page_penalty=True),
+    0x55: Instruction("EOR", AddressingMode.ZERO_PAGE_X, 2, 4),
+    0x59: Instruction("EOR", AddressingMode.ABSOLUTE_Y, 3, 4, page_penalty=True),
+    0x5d: Instruction("EOR", AddressingMode.ABSOLUTE_X, 3, 4, page_penalty=True),
+    0xe6: Instruction("INC", AddressingMode.ZERO_PAGE, 2, 5),
+    0xee: Instruction("INC", AddressingMode.ABSOLUTE, 3, 6),
+    0xf6: Instruction("INC", AddressingMode.ZERO_PAGE_X, 2, 6),
+    0xfe: Instruction("INC", AddressingMode.ABSOLUTE_X, 3, 7),
+    0xe8: Instruction("INX", None, 1, 2),
+    0xc8: Instruction("INY", None, 1, 2),
+    0x4c: Instruction("JMP", AddressingMode.ABSOLUTE, 3, 3),
+    0x6c: Instruction("JMP", None, 3, 5),
+    0x20: Instruction("JSR", None, 3, 6),
+    0xa1: Instruction("LDA", AddressingMode.INDIRECT_X, 2, 6),
+    0xa5: Instruction("LDA", AddressingMode.ZERO_PAGE, 2, 3),
+    0xa9: Instruction("LDA", AddressingMode.IMMEDIATE, 2, 2),
+    0xad: Instruction("LDA", AddressingMode.ABSOLUTE, 3, 4),
+    0xb1: Instruction("LDA", AddressingMode.INDIRECT_Y, 2, 5, page_penalty=True),
+    0xb5: Instruction("LDA", AddressingMode.ZERO_PAGE_X, 2, 4),
+    0xb9: Instruction("LDA", AddressingMode.ABSOLUTE_Y, 3, 4, page_penalty=True),
+    0xbd: Instruction("LDA", AddressingMode.ABSOLUTE_X, 3, 4, page_penalty=True),
+    0xa2: Instruction("LDX", AddressingMode.IMMEDIATE, 2, 2),
+    0xa6: Instruction("LDX", AddressingMode.ZERO_PAGE, 2, 3),
+    0xae: Instruction("LDX", AddressingMode.ABSOLUTE, 3, 4),
+    0xb6: Instruction("LDX", AddressingMode.ZERO_PAGE_Y, 2, 4),
+    0xbe: Instruction("LDX", AddressingMode.ABSOLUTE_Y, 3, 4, page_penalty=True),
+    0xa0: Instruction("LDY", AddressingMode.IMMEDIATE, 2, 2),
+    0xa4: Instruction("LDY", AddressingMode.ZERO_PAGE, 2, 3),
+    0xac: Instruction("LDY", AddressingMode.ABSOLUTE, 3, 4),
+    0xb4: Instruction("LDY", AddressingMode.ZERO_PAGE_X, 2, 4),
+    0xbc: Instruction("LDY", AddressingMode.ABSOLUTE_X, 3, 4, page_penalty=True),
+    0x46: Instruction("LSR", AddressingMode.ZERO_PAGE, 2, 5),
+    0x4a: Instruction("LSR", None, 1, 2),
+    0x4e: Instruction("LSR", AddressingMode.ABSOLUTE, 3, 6),
+    0x56: Instruction("LSR", AddressingMode.ZERO_PAGE_X, 2, 6),
+    0x5e: Instruction("LSR", AddressingMode.ABSOLUTE_X, 3, 7),
+    0xea: Instruction("NOP", None, 1, 2),
+    0x01: Instruction("ORA", AddressingMode.INDIRECT_X, 2, 6),
+    0x05: Instruction("ORA", AddressingMode.ZERO_PAGE, 2, 3),
+    0x09: Instruction("ORA", AddressingMode.IMMEDIATE, 2, 2),
+    0x0d: Instruction("ORA", AddressingMode.ABSOLUTE, 3, 4),
+    0x11: Instruction("ORA", AddressingMode.INDIRECT_Y, 2, 5, page_penalty=True),
+    0x15: Instruction("ORA", AddressingMode.ZERO_PAGE_X, 2, 4),
+    0x19: Instruction("ORA", AddressingMode.ABSOLUTE_Y, 3, 4, page_penalty=True),
+    0x1d: Instruction("ORA", AddressingMode.ABSOLUTE_X, 3, 4, page_penalty=True),
+    0x48: Instruction("PHA", None, 1, 3),
+    0x08: Instruction("PHP", None, 1, 3),
+    0x68: Instruction("PLA", None, 1, 4),
+    0x28: Instruction("PLP", None, 1, 4),
+    0x26: Instruction("ROL", AddressingMode.ZERO_PAGE, 2, 5),
+    0x2a: Instruction("ROL", None, 1, 2),
+    0x2e: Instruction("ROL", AddressingMode.ABSOLUTE, 3, 6),
+    0x36: Instruction("ROL", AddressingMode.ZERO_PAGE_X, 2, 6),
+    0x3e: Instruction("ROL", AddressingMode.ABSOLUTE_X, 3, 7),
+    0x66: Instruction("ROR", AddressingMode.ZERO_PAGE, 2, 5),
+    0x6a: Instruction("ROR", None, 1, 2),
+    0x6e: Instruction("ROR", AddressingMode.ABSOLUTE, 3, 6),
+    0x76: Instruction("ROR", AddressingMode.ZERO_PAGE_X, 2, 6),
+    0x7e: Instruction("ROR", AddressingMode.ABSOLUTE_X, 3, 7),
+    0x40: Instruction("RTI", None, 1, 6),
+    0x60: Instruction("RTS", None, 1, 6),
+    0xe1: Instruction("SBC", AddressingMode.INDIRECT_X, 2, 6),
+    0xe5: Instruction("SBC", AddressingMode.ZERO_PAGE, 2, 3),
+    0xe9: Instruction("SBC", AddressingMode.IMMEDIATE, 2, 2),
+    0xed: Instruction("SBC", AddressingMode.ABSOLUTE, 3, 4),
+    0xf1: Instruction("SBC", AddressingMode.INDIRECT_Y, 2, 5, page_penalty=True),
+    0xf5: Instruction("SBC", AddressingMode.ZERO_PAGE_X, 2, 4),
+    0xf9: Instruction("SBC", AddressingMode.ABSOLUTE_Y, 3, 4, page_penalty=True),
+    0xfd: Instruction("SBC", AddressingMode.ABSOLUTE_X, 3, 4, page_penalty=True),
+    0x38: Instruction("SEC", None, 1, 2),
+    0xf8: Instruction("SED", None, 1, 2),
+    0x78: Instruction("SEI", None, 1, 2),
+    0x81: Instruction("STA", AddressingMode.INDIRECT_X, 2, 6),
+    0x85: Instruction("STA", AddressingMode.ZERO_PAGE, 2, 3),
+    0x8d: Instruction("STA", AddressingMode.ABSOLUTE, 3, 4),
+    0x91: Instruction("STA", AddressingMode.INDIRECT_Y, 2, 6),
+    0x95: Instruction("STA", AddressingMode.ZERO_PAGE_X, 2, 4),
+    0x99: Instruction("STA", AddressingMode.ABSOLUTE_Y, 3, 5),
+    0x9d: Instruction("STA", AddressingMode.ABSOLUTE_X, 3, 5),
+    0x86: Instruction("STX", AddressingMode.ZERO_PAGE, 2, 3),
+    0x8e: Instruction("STX", AddressingMode.ABSOLUTE, 3, 4),
+    0x96: Instruction("STX", AddressingMode.ZERO_PAGE_Y, 2, 4),
+    0x84: Instruction("STY", AddressingMode.ZERO_PAGE, 2, 3),
+    0x8c: Instruction("STY", AddressingMode.ABSOLUTE, 3, 4),
+    0x94: Instruction("STY", AddressingMode.ZERO_PAGE_X, 2, 4),
+    0xaa: Instruction("TAX", None, 1, 2),
+    0xa8: Instruction("TAY", None, 1, 2),
+    0xba: Instruction("TSX", None, 1, 2),
+    0x8a: Instruction("TXA", None, 1, 2),
+    0x9a: Instruction("TXS", None, 1, 2),
+    0x98: Instruction("TYA", None, 1, 2),
+
+}
+"""Legal opcodes of the NMOS 6502.
+
+Branches, JMP (indirect) and JSR have no addressing mode. Taken branches take one more cycle than listed, or two more
+when the branch target is on a different page.
+"""
@@ -1,13 +1,25 @@
 """Memory for running the CPU."""
 
 import logging
+import sys
 from abc import ABC, abstractmethod
 from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Self, override
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Self
+
+if sys.version_info < (3, 12):
+    from another6502.utils import override
+else:
+    from typing import override
 
 logger = logging.getLogger(__name__)
 
+PAGE_SIZE = 0x100
+"""Number of bytes in a page of memory."""
+
 class Memory(ABC):
     """Abstract interface for computer memory."""
 
@@ -44,6 +56,21 @@ class Memory(ABC):
 
         """
 
+    def page_buffer(self, page: int) -> memoryview | None:  # noqa: ARG002
+        """Return a writable view of a page of memory, if the page can be accessed without calling `read` and `write`.
+
+        Reading and writing the view has to be equivalent to `read` and `write`, so only plain memory without side
+        effects can provide one.
+
+        Args:
+            page: Number of the page, i.e., the address of its first byte divided by `PAGE_SIZE`.
+
+        Returns:
+            buffer: View of the `PAGE_SIZE` bytes of the page or None.
+
+        """
+        return None
+
 
 class MemoryBlock(Memory):
     """Simple block of contiguous memory of configurable size."""
@@ -72,15 +99,25 @@ class MemoryBlock(Memory):
 
     @override
     def read(self, address: int) -> int:
-        if not self._check_address_in_bounds(address):
-            return 0
-        return self.mem[address]
+        # index first and check the bounds only on failure, negative indices would wrap around
+        if address >= 0:
+            try:
+                return self.mem[address]
+            except IndexError:
+                pass
+        self._check_address_in_bounds(address)
+        return 0
 
     @override
     def write(self, address: int, value: int) -> None:
-        if not self._check_address_in_bounds(address):
-            return
-        self.mem[address] = value & 0xff
+        if address >= 0:
+            try:
+                self.mem[address] = value & 0xff
+            except IndexError:
+                pass
+            else:
+                return
+        self._check_address_in_bounds(address)
 
     def write_bytes(self, start_address: int, sequence: bytes) -> None:
         """Write a sequence of bytes to a memory region.
@@ -93,9 +130,17 @@ class MemoryBlock(Memory):
             IndexError: If sequence at specified location exceeds the bounds of the memory.
 
         """
-        self._check_address_in_bounds(start_address)
-        self._check_address_in_bounds(start_address + len(sequence) - 1)
-        self.mem[start_address:start_address + len(sequence) - 1] = sequence
+        if start_address < 0 or start_address + len(sequence) > len(self.mem):
+            msg = f"Sequence of {len(sequence)} bytes at {start_address:04X} exceeds memory range."
+            raise IndexError(msg)
+        self.mem[start_address:start_address + len(sequence)] = sequence
+
+    @override
+    def page_buffer(self, page: int) -> memoryview | None:
+        start = page * PAGE_SIZE
+        if start < 0 or start + PAGE_SIZE > len(self.mem):
+            return None
+        return memoryview(self.mem)[start:start + PAGE_SIZE]
 
     def write_bytes_hex(self, start_address: int, sequence: str) -> None:
         """Write a sequence of bytes written as a string of hexadecimal digits to a memory region.
@@ -133,7 +178,7 @@ class MemoryMapRegion:
         """Highest address within the memory region."""
         return self.offset + len(self.memory) - 1
 
-    def overlaps(self, other: Self) -> bool:
+    def overlaps(self, other: "Self") -> bool:
         """Check if two memory regions overlap."""
         return other.offset in self or other.top in self
 
@@ -175,8 +220,10 @@ class MemoryMap(Memory):
     def __init__(self) -> None:  # noqa: D107
         super().__init__()
         self.regions: list[MemoryMapRegion] = []
+        self._pages: list[tuple[Callable[[int], int], Callable[[int, int], None], int]] = []
+        self._buffers: list[memoryview | None] = []
 
-    def add_block(self, offset: int, block: Memory) -> Self:
+    def add_block(self, offset: int, block: Memory) -> "Self":
         """Add a memory block to the map at a given offset address.
 
         If `offset` is 0x0100, the the first byte within the block can be found at address 0x0100 within the memory map.
@@ -186,8 +233,36 @@ class MemoryMap(Memory):
             msg = "Memory region overlaps existing region in memory map."
             raise ValueError(msg)
         self.regions.append(region)
+        self._build_page_table()
         return self
 
+    def _build_page_table(self) -> None:
+        """Map each page of the address space to the accessors of the memory behind it.
+
+        A page that lies within a single region is mapped to the `read` and `write` methods of that region's memory and
+        the region's offset, and to a view of its contents if the region is page aligned and provides one. Any other
+        page, e.g., one that is shared by several MMIO registers, is mapped to the methods that search for the
+        containing region of each address.
+        """
+        slow_path = (self._read_from_containing_region, self._write_to_containing_region, 0)
+        n_pages = max(0x10000, len(self)) // PAGE_SIZE
+        self._pages = [slow_path] * n_pages
+        self._buffers = [None] * n_pages
+        for region in self.regions:
+            first_page = -(-region.offset // PAGE_SIZE)
+            last_page = (region.top + 1) // PAGE_SIZE
+            entry = (region.memory.read, region.memory.write, region.offset)
+            for page in range(first_page, last_page):
+                self._pages[page] = entry
+                if region.offset % PAGE_SIZE == 0:
+                    self._buffers[page] = region.memory.page_buffer(page - region.offset // PAGE_SIZE)
+
+    @override
+    def page_buffer(self, page: int) -> memoryview | None:
+        if 0 <= page < len(self._buffers):
+            return self._buffers[page]
+        return None
+
     def get_containing_region(self, address: int) -> MemoryMapRegion | None:
         """Return the region containing `address` or None."""
         try:
@@ -202,17 +277,47 @@ class MemoryMap(Memory):
 
     @override
     def read(self, address: int) -> int:
+        page = address >> 8
+        # negative pages would wrap around to the end of the page table
+        if page < 0:
+            return self._read_from_containing_region(address)
+        try:
+            buffer = self._buffers[page]
+        except IndexError:
+            return self._read_from_containing_region(address)
+        if buffer is not None:
+            return buffer[address & 0xff]
+        read, _, offset = self._pages[page]
+        return read(address - offset)
+
+    @override
+    def write(self, address: int, value: int) -> None:
+        page = address >> 8
+        # negative pages would wrap around to the end of the page table
+        if page < 0:
+            return self._write_to_containing_region(address, value)
+        try:
+            buffer = self._buffers[page]
+        except IndexError:
+            return self._write_to_containing_region(address, value)
+        if buffer is not None:
+            buffer[address & 0xff] = value & 0xff
+            return None
+        _, write, offset = self._pages[page]
+        return write(address - offset, value)
+
+    def _read_from_containing_region(self, address: int) -> int:
+        """Read from the memory of the region containing an address."""
         region = self.get_containing_region(address)
         if region is None:
             logger.warning(f"Tried to read address 0x{address:04x} that is not part of memory map.")
             return 0
         return region.memory.read(address - region.offset)
 
-    @override
-    def write(self, address: int, value: int) -> None:
+    def _write_to_containing_region(self, address: int, value: int) -> None:
+        """Write to the memory of the region containing an address."""
         region = self.get_containing_region(address)
         if region is None:
             logger.warning(f"Tried to write to address 0x{address:04x} that is not part of memory map.")
             return None
         return region.memory.write(address - region.offset, value)
-
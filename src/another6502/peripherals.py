@@ -1,24 +1,32 @@
 """Collection of common peripherals for emulated systems."""
 
+import os
 import sys
 import termios
+import threading
 import tty
-from queue import Queue
+from queue import SimpleQueue
 from typing import ClassVar
 
 from another6502.memory import MemoryMap, MMIORegister
 
+STDIN_CHUNK_SIZE = 64
+"""Maximum number of bytes `monitor_stdin` reads from stdin at once."""
+
 
 class TerminalPeripheral:
     """Peripheral that allows the emulated system to interact with input and output streams."""
 
     STATUS_WAITING: ClassVar[int] = 7
+    OUTPUT_BUFFER_SIZE: ClassVar[int] = 256
 
     def __init__(self) -> None:
         """Initialize MMIO registers and build memory map.
 
         After initialization, the peripheral can be used by reading from and writing to the registers in `mmio_block`.
+        Output is buffered until a line is completed, the buffer is full or `flush` is called.
         """
+        self._output_buffer = bytearray()
         self._input_buffer: int = 0
         self._input_buffer_waiting: bool = True
         self._status_register = MMIORegister(read_callback=self._status)
@@ -35,16 +43,22 @@ class TerminalPeripheral:
         return status
 
     def _output_character(self, value: int) -> None:
-        """Interpret value as ASCII character and print it to stdout."""
-        try:
-            ch = value.to_bytes(1, "little").decode()
-        except UnicodeDecodeError:
-            ch = "?"
+        """Interpret value as ASCII character and buffer it for printing to stdout."""
+        if value == ord("\r"):
+            self._output_buffer += b"\r\n"
+            self.flush()
+            return
+
+        self._output_buffer.append(value if value < 0x80 else ord("?"))  # noqa: PLR2004
+        if len(self._output_buffer) >= self.OUTPUT_BUFFER_SIZE:
+            self.flush()
 
-        sys.stdout.write(ch)
-        if ch == "\r":
-            sys.stdout.write("\n")
-        sys.stdout.flush()
+    def flush(self) -> None:
+        """Print the buffered output to stdout."""
+        if self._output_buffer:
+            sys.stdout.write(self._output_buffer.decode())
+            sys.stdout.flush()
+            self._output_buffer.clear()
 
     def _input_character(self) -> int:
         self._input_buffer_waiting = False
@@ -56,21 +70,27 @@ class TerminalPeripheral:
         self._input_buffer_waiting = True
 
 
-def monitor_stdin(input_queue: Queue[bytes | None]) -> None:
+def monitor_stdin(input_queue: SimpleQueue[bytes | None], input_event: threading.Event | None = None) -> None:
     """Set terminal to raw mode and put incoming bytes on stdin into a queue.
 
     When this function receives a Ctrl+C (0x03) or encounters an exception, it restores the terminal to its
-    previous state.
+    previous state. If `input_event` is given, it is set whenever bytes were put into the queue, e.g., to wake up `run`.
     """
     fd = sys.stdin.fileno()
     old_settings = termios.tcgetattr(fd)
     try:
         tty.setraw(fd)
         while True:
-            ch = sys.stdin.buffer.read(1)
-            if ch == b"\x03":  # Ctrl+C / End of Text
+            # read whatever is available at once, e.g., all of a pasted text
+            data = os.read(fd, STDIN_CHUNK_SIZE)
+            end = not data or b"\x03" in data  # end of file or Ctrl+C / End of Text
+            for byte in data.partition(b"\x03")[0]:
+                input_queue.put(bytes((byte,)))
+            if end:
                 input_queue.put(None)
+            if input_event is not None:
+                input_event.set()
+            if end:
                 return
-            input_queue.put(ch)
     finally:
         termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
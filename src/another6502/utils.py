@@ -1,11 +1,9 @@
 """Utilities to unspecific for other modules."""
 
-from typing import Never
+from collections.abc import Callable
+from typing import TypeVar
 
-
-def assert_never(arg: Never) -> Never:  # noqa: ARG001
-    """Help the type checker perform exhaustiveness checks."""
-    raise AssertionError
+_Method = TypeVar("_Method", bound=Callable[..., object])
 
 
 def dec_to_bcd(dec: int) -> int:
@@ -17,3 +15,8 @@ def dec_to_bcd(dec: int) -> int:
     tens = dec // 10
     ones = dec % 10
     return (tens << 4) | ones
+
+
+def override(method: _Method) -> _Method:
+    """Stand in for `typing.override`, which is missing before Python 3.12, e.g., on PyPy."""
+    return method
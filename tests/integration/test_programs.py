@@ -1,6 +1,9 @@
 """Test simple 6502 machine code to exercise instructions in combination."""
 
-from another6502.cpu import CPU6502, run
+import threading
+import time
+
+from another6502.cpu import CPU6502, TICKS_PER_SECOND, StepResult, run
 
 
 def test_minimal_program(cpu: CPU6502):
@@ -58,3 +61,118 @@ def test_subroutine_program(cpu: CPU6502):
 
     assert cpu.cycles == 29  # noqa: PLR2004
     assert cpu.a == 6  # noqa: PLR2004
+
+
+def test_self_modifying_program(cpu: CPU6502):
+    """Test if instructions overwritten by the program itself are decoded again."""
+    cpu.memory.write_bytes_hex(0x300,
+                    # * = $0300
+        "a2 02"     #       LDX #$02
+        "a0 00"     #       LDY #$00
+        "c8"        # LOOP: INY
+        "a9 ea"     #       LDA #$EA
+        "8d 04 03"  #       STA LOOP  ; replace INY with NOP
+        "ca"        #       DEX
+        "d0 f7"     #       BNE LOOP
+        "00",       #       BRK
+    )
+    cpu.pc = 0x0300
+    run(cpu)
+
+    assert cpu.y == 1
+
+
+def test_invalidate_decode_cache(cpu: CPU6502):
+    """Test if code modified from outside the CPU is decoded again after invalidating the decode cache."""
+    cpu.memory.write_bytes_hex(0x300, "e8 00")  # INX, BRK
+    cpu.pc = 0x0300
+    run(cpu)
+
+    cpu.memory.write_bytes_hex(0x300, "c8 00")  # INY, BRK
+    cpu.invalidate_decode_cache(0x0300, 0x0302)
+    cpu.pc = 0x0300
+    run(cpu)
+
+    assert cpu.x == 1
+    assert cpu.y == 1
+
+
+def test_program_modifying_its_block(cpu: CPU6502):
+    """Test if instructions overwritten by an earlier instruction of the same block are executed in their new form."""
+    cpu.memory.write_bytes_hex(0x300,
+                    # * = $0300
+        "a2 09"     #       LDX #$09
+        "a9 ea"     #       LDA #$EA
+        "9d 00 03"  #       STA $0300,X  ; replace the last INY with NOP
+        "c8"        #       INY
+        "c8"        #       INY
+        "c8"        #       INY
+        "00",       #       BRK
+    )
+    cpu.pc = 0x0300
+    cpu.BLOCK_COMPILE_THRESHOLD = 1  # compile the block right away
+    run(cpu)
+
+    assert cpu.y == 2  # noqa: PLR2004
+
+
+def test_interrupt_hook_ticks(cpu: CPU6502):
+    """Test if the interrupt hook is called once per tick when the execution speed is limited."""
+    cpu.memory.write_bytes_hex(0x200,
+        "a2 00"  # LDX #$00
+        "ca"     # loop: DEX
+        "d0 fd"  # BNE loop
+        "00",    # BRK
+    )
+    cpu.pc = 0x200
+    calls = []
+    run(cpu, interrupt_hook=calls.append, cycles_per_second=100 * TICKS_PER_SECOND)
+
+    assert len(calls) == cpu.cycles // 100
+
+
+def test_wakeup(cpu: CPU6502):
+    """Test if setting the wakeup event skips waiting for the wall clock."""
+    cpu.memory.write_bytes_hex(0x200,
+        "a2 05"  # LDX #$05
+        "ca"     # loop: DEX
+        "d0 fd"  # BNE loop
+        "00",    # BRK
+    )
+    cpu.pc = 0x200
+    wakeup = threading.Event()
+    start = time.perf_counter()
+    run(cpu, interrupt_hook=lambda _: wakeup.set(), cycles_per_second=1, wakeup=wakeup)
+
+    assert time.perf_counter() - start < 1
+
+
+def test_block_compile_threshold(cpu: CPU6502):
+    """Test if a block is compiled only after it has been executed a few times."""
+    cpu.memory.write_bytes_hex(0x200,
+        "e8"  # INX
+        "c8"  # INY
+        "00", # BRK
+    )
+    for _ in range(CPU6502.BLOCK_COMPILE_THRESHOLD - 1):
+        cpu.pc = 0x200
+        assert cpu.step_block() == (StepResult.NORMAL, 1)
+    cpu.pc = 0x200
+    assert cpu.step_block() == (StepResult.NORMAL, 2)
+    assert cpu.pc == 0x202  # noqa: PLR2004
+    assert cpu.x == CPU6502.BLOCK_COMPILE_THRESHOLD
+
+
+def test_run_cycles(cpu: CPU6502):
+    """Test if blocks are executed until the cycle budget is used up or BRK is executed."""
+    cpu.memory.write_bytes_hex(0x200,
+        "a2 03"  # LDX #$03
+        "ca"     # loop: DEX
+        "d0 fd"  # BNE loop
+        "00",    # BRK
+    )
+    cpu.pc = 0x200
+    assert cpu.run_cycles(5) == (StepResult.NORMAL, 3)
+    assert cpu.cycles == 7  # noqa: PLR2004
+    assert cpu.run_cycles(100) == (StepResult.BRK, 5)
+    assert cpu.x == 0
@@ -0,0 +1,212 @@
+"""Test compiled code against the methods of the CPU that implement the instructions."""
+
+import random
+from types import MethodType
+
+import pytest
+
+from another6502.codegen import _is_control_flow, adc_results, compile_block, compile_handlers
+from another6502.cpu import CPU6502
+from another6502.instructions import INSTRUCTIONS, AddressingMode
+from another6502.memory import MemoryBlock, MemoryMap, MMIORegister
+
+CODE_LOCATION = 0x0200
+N_STATES = 10
+BLOCK_OPCODES = [
+    opcode for opcode, instruction in sorted(INSTRUCTIONS.items())
+    if instruction.mnemonic != "BRK"
+]
+SEQUENCE_OPCODES = [opcode for opcode in BLOCK_OPCODES if not _is_control_flow(INSTRUCTIONS[opcode])]
+N_SEQUENCES = 200
+HANDLER_OPCODES = [opcode for opcode, instruction in sorted(INSTRUCTIONS.items()) if instruction.mnemonic != "BRK"]
+
+
+def random_cpu(rng: random.Random, opcode: int, *, compiled: bool = True) -> CPU6502:
+    """Return a CPU with random registers and memory that executes `opcode` followed by BRK."""
+    memory = MemoryBlock()
+    memory.mem[:] = rng.randbytes(len(memory))
+    memory.write(CODE_LOCATION, opcode)
+    memory.write(CODE_LOCATION + INSTRUCTIONS[opcode].length, 0x00)
+
+    cpu = CPU6502(memory, override_initial_pc=CODE_LOCATION)
+    cpu.opcodes = cpu.build_opcode_table(compiled=compiled)
+    cpu.a = rng.randrange(0x100)
+    cpu.x = rng.randrange(0x100)
+    cpu.y = rng.randrange(0x100)
+    cpu.sp = rng.randrange(0x100)
+    cpu.status = rng.randrange(0x100)
+    return cpu
+
+
+def state(cpu: CPU6502) -> tuple[int, ...]:
+    """Return the registers and cycle count of a CPU."""
+    return (cpu.a, cpu.x, cpu.y, cpu.sp, cpu.pc, cpu.status, cpu.cycles)
+
+
+@pytest.mark.parametrize("opcode", BLOCK_OPCODES, ids=lambda opcode: f"{opcode:02x}")
+def test_single_instruction_block(opcode: int):
+    """Test if a block of one instruction has the same effect as executing the instruction with `step`."""
+    for seed in range(N_STATES):
+        reference = random_cpu(random.Random(seed), opcode, compiled=False)  # noqa: S311
+        compiled = random_cpu(random.Random(seed), opcode)  # noqa: S311
+        # alternate between reading through `read`, indexing the memory and indexing its pages
+        memory = compiled.memory
+        buffer = memory.mem if seed % 3 == 1 else None  # type: ignore[attr-defined]
+        pages = [memory.page_buffer(page) for page in range(0x100)] if seed % 3 == 2 else None  # noqa: PLR2004
+        block = compile_block(memory.read, memory.write, CODE_LOCATION, buffer, pages)
+        assert block is not None
+        assert block.n_instructions == 1
+
+        try:
+            reference.step()
+        except ValueError:  # invalid BCD operands in decimal mode
+            with pytest.raises(ValueError, match="Decimal"):
+                block.function(compiled)
+            continue
+        block.function(compiled)
+
+        assert state(compiled) == state(reference), block.source
+        assert compiled.memory.mem == reference.memory.mem  # type: ignore[attr-defined]
+
+
+def test_instruction_sequence_block():
+    """Test if a block of random instructions has the same effect as executing them one by one with `step`."""
+    for seed in range(N_SEQUENCES):
+        rng = random.Random(seed)  # noqa: S311
+        opcodes = rng.choices(SEQUENCE_OPCODES, k=8)
+        reference = random_cpu(random.Random(seed), opcodes[0], compiled=False)  # noqa: S311
+        reference.status &= ~(1 << CPU6502.STATUS_D)
+        address = CODE_LOCATION
+        for opcode in opcodes:
+            reference.memory.write(address, opcode)
+            address += INSTRUCTIONS[opcode].length
+        reference.memory.write(address, 0x00)
+        compiled = CPU6502(MemoryBlock(), override_initial_pc=CODE_LOCATION)
+        compiled.memory.mem[:] = reference.memory.mem  # type: ignore[attr-defined]
+        compiled.a, compiled.x, compiled.y = reference.a, reference.x, reference.y
+        compiled.sp, compiled.status = reference.sp, reference.status
+        block = compile_block(compiled.memory.read, compiled.memory.write, CODE_LOCATION)
+        assert block is not None
+
+        try:
+            for _ in range(block.n_instructions):
+                reference.step()
+        except ValueError:  # invalid BCD operands in decimal mode
+            with pytest.raises(ValueError, match="Decimal"):
+                block.function(compiled)
+            continue
+        block.function(compiled)
+
+        assert state(compiled) == state(reference), block.source
+        assert compiled.memory.mem == reference.memory.mem  # type: ignore[attr-defined]
+
+
+def test_dead_flag_updates():
+    """Test if flag updates that are overwritten within a block are left out."""
+    memory = MemoryBlock()
+    memory.write_bytes_hex(CODE_LOCATION,
+        "a9 00"  # LDA #$00
+        "aa"     # TAX
+        "e8"     # INX
+        "e0 01"  # CPX #$01
+        "d0 f8", # BNE *-8
+    )
+
+    block = compile_block(memory.read, memory.write, CODE_LOCATION)
+    assert block is not None
+    assert block.source.count("status = (status &") == 1
+
+    cpu = CPU6502(memory, override_initial_pc=CODE_LOCATION)
+    block.function(cpu)
+    assert cpu.status & 0x83 == 1 << CPU6502.STATUS_Z | 1 << CPU6502.STATUS_C
+    assert cpu.x == 1
+
+
+@pytest.mark.parametrize("opcode", HANDLER_OPCODES, ids=lambda opcode: f"{opcode:02x}")
+def test_handler(opcode: int):
+    """Test if the compiled handler of an opcode has the same effect as the method implementing the instruction."""
+    for seed in range(N_STATES):
+        reference = random_cpu(random.Random(seed), opcode, compiled=False)  # noqa: S311
+        compiled = random_cpu(random.Random(seed), opcode, compiled=False)  # noqa: S311
+        # alternate between reading through `read` and indexing the memory
+        memory = compiled.memory
+        buffer = memory.mem if seed % 2 else None  # type: ignore[attr-defined]
+        handler = compile_handlers(memory.read, memory.write, buffer)[opcode]
+        compiled.opcodes[opcode] = MethodType(handler, compiled)
+
+        try:
+            reference_result = reference.step()
+        except ValueError:  # invalid BCD operands in decimal mode
+            with pytest.raises(ValueError, match="Decimal"):
+                compiled.step()
+            continue
+
+        assert compiled.step() == reference_result
+        assert state(compiled) == state(reference)
+        assert compiled.memory.mem == reference.memory.mem  # type: ignore[attr-defined]
+
+
+@pytest.mark.parametrize("carry", [0, 1])
+def test_adc_results(carry: int):
+    """Test if the table of binary additions agrees with the ADC method of the CPU."""
+    results = adc_results()
+    cpu = CPU6502(MemoryBlock())
+    for a in range(0, 0x100, 0x0f):
+        for value in range(0, 0x100, 0x0f):
+            cpu.memory.write(0x0000, value)
+            cpu.pc = 0x0000
+            cpu.a = a
+            cpu.status = carry
+            cpu.adc(AddressingMode.IMMEDIATE)
+            assert results[(a << 9) | (value << 1) | carry] == cpu.a | (cpu.status << 8)
+
+
+def test_uncompilable_instruction():
+    """Test if blocks are not compiled for instructions that the CPU has to execute itself."""
+    memory = MemoryBlock()
+    memory.write_bytes_hex(CODE_LOCATION, "00")  # BRK
+    assert compile_block(memory.read, memory.write, CODE_LOCATION) is None
+
+
+def test_block_end():
+    """Test if blocks end after control flow instructions and before instructions that cannot be compiled."""
+    memory = MemoryBlock()
+    memory.write_bytes_hex(CODE_LOCATION,
+        "e8"     # INX
+        "d0 fd"  # BNE *-1
+        "e8",    # INX
+    )
+    memory.write_bytes_hex(CODE_LOCATION + 0x10,
+        "e8"     # INX
+        "00",    # BRK
+    )
+
+    block = compile_block(memory.read, memory.write, CODE_LOCATION)
+    assert block is not None
+    assert block.n_instructions == 2  # noqa: PLR2004
+    assert block.stop == CODE_LOCATION + 3
+
+    block = compile_block(memory.read, memory.write, CODE_LOCATION + 0x10)
+    assert block is not None
+    assert block.n_instructions == 1
+
+
+def test_block_end_at_mmio():
+    """Test if blocks end before code on pages of memory-mapped I/O, without reading it."""
+    reads = []
+    ram = MemoryBlock(0x300)
+    memory = MemoryMap().add_block(0, ram).add_block(0x300, MMIORegister(lambda: reads.append(1) or 0xe8))
+    ram.write_bytes_hex(0x2fc,
+        "e8"     # INX
+        "e8"     # INX
+        "e8"     # INX
+        "a9",    # LDA #$e8 (operand read from $0300)
+    )
+    pages = [memory.page_buffer(page) for page in range(0x100)]
+
+    block = compile_block(memory.read, memory.write, 0x2fc, None, pages)
+    assert block is not None
+    assert block.n_instructions == 3  # noqa: PLR2004
+    assert block.stop == 0x2ff  # noqa: PLR2004
+    assert compile_block(memory.read, memory.write, 0x300, None, pages) is None
+    assert not reads
@@ -58,3 +58,16 @@ def test_compare_logic(cpu: CPU6502, register_value: int, operand: int, n: int,
     assert (cpu.status >> CPU6502.STATUS_N) & 1 == n
     assert (cpu.status >> CPU6502.STATUS_Z) & 1 == z
     assert (cpu.status >> CPU6502.STATUS_C) & 1 == c
+
+
+@pytest.mark.parametrize("register", ["a", "x", "y"])
+def test_compare_register(cpu: CPU6502, register: str):
+    """Test if CMP, CPX and CPY compare the operand with their own register."""
+    cpu.memory.write(0x0000, 0x42)
+    cpu.a = cpu.x = cpu.y = 0x00
+    setattr(cpu, register, 0x42)
+    {"a": cpu.cmp, "x": cpu.cpx, "y": cpu.cpy}[register](mode=AddressingMode.IMMEDIATE)
+
+    assert (cpu.status >> CPU6502.STATUS_Z) & 1 == 1
+    assert (cpu.status >> CPU6502.STATUS_C) & 1 == 1
+    assert cpu.cycles == 2  # noqa: PLR2004
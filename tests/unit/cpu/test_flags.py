@@ -6,19 +6,22 @@ from another6502.cpu import CPU6502
 
 
 @pytest.mark.parametrize(
-    ("a_initial", "operand", "result", "v"),
+    ("result", "n", "z"),
     [
-        (0x00, 0x00, 0x00, 0),  # 0 + 0 = 0, smoke test
-        (0xc0, 0x80, 0x40, 1),  # -64 + (-128) = 64
-        (0xc0, 0xc0, 0x80, 0),  # -64 + (-64) = -128
-        (0x80, 0xff, 0x7f, 1),  # -128 + (-1) = 127
-        (0x40, 0x01, 0x80, 1),  # 64 + 1 = -128
-        (0xff, 0x02, 0x01, 0),  # -1 + 2 = 1
+        (0x00, 0, 1),
+        (0x01, 0, 0),
+        (0x80, 1, 0),
+        (0xff, 1, 0),
     ],
 )
-def test_update_overflow_flag(cpu: CPU6502, a_initial: int, operand: int, result: int, v: int):  # noqa: D103
-    cpu.update_overflow_flag(a_initial, operand, result)
-    assert (cpu.status >> CPU6502.STATUS_V) & 1 == v
+def test_update_nz_flags(cpu: CPU6502, result: int, n: int, z: int):
+    """Test if N and Z are updated together without touching the other flags."""
+    cpu.status = 0xff & ~((n << CPU6502.STATUS_N) | (z << CPU6502.STATUS_Z))
+    other_flags = cpu.status & ~CPU6502.NZ_MASK
+    cpu.update_nz_flags(result)
+    assert (cpu.status >> CPU6502.STATUS_N) & 1 == n
+    assert (cpu.status >> CPU6502.STATUS_Z) & 1 == z
+    assert cpu.status & ~CPU6502.NZ_MASK == other_flags
 
 
 def test_clc(cpu: CPU6502):  # noqa: D103
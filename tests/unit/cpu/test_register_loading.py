@@ -1,11 +1,50 @@
 """Test instructions for loading data from memories into registers, i.e., LDA, LDX, and LDY."""
 
+import pytest
+
 from another6502.cpu import CPU6502, AddressingMode
 from tests.unit.cpu import (
     ABSOLUTE_LOCATION,
+    INDEX,
+    INDIRECT_DATA_LOCATION,
     PAGE_CROSS_INDEX,
     TEST_VALUE,
+    ZERO_PAGE_LOCATION,
+    ZERO_PAGE_POINTER_LOCATION,
+)
+
+
+@pytest.mark.parametrize(
+    ("mode", "operand", "value_location", "cycles"),
+    [
+        (AddressingMode.IMMEDIATE, bytes([TEST_VALUE]), None, 2),
+        (AddressingMode.ZERO_PAGE, bytes([ZERO_PAGE_LOCATION]), ZERO_PAGE_LOCATION, 3),
+        (AddressingMode.ZERO_PAGE_X, bytes([ZERO_PAGE_LOCATION]), ZERO_PAGE_LOCATION + INDEX, 4),
+        (AddressingMode.ABSOLUTE, ABSOLUTE_LOCATION.to_bytes(2, "little"), ABSOLUTE_LOCATION, 4),
+        (AddressingMode.ABSOLUTE_X, ABSOLUTE_LOCATION.to_bytes(2, "little"), ABSOLUTE_LOCATION + INDEX, 4),
+        (AddressingMode.ABSOLUTE_Y, ABSOLUTE_LOCATION.to_bytes(2, "little"), ABSOLUTE_LOCATION + INDEX, 4),
+        (AddressingMode.INDIRECT_X, bytes([ZERO_PAGE_POINTER_LOCATION - INDEX]), INDIRECT_DATA_LOCATION, 6),
+        (AddressingMode.INDIRECT_Y, bytes([ZERO_PAGE_POINTER_LOCATION]), INDIRECT_DATA_LOCATION + INDEX, 5),
+    ],
 )
+def test_lda_addressing_modes(
+    cpu: CPU6502, mode: AddressingMode, operand: bytes, value_location: int | None, cycles: int,
+):
+    """Test LDA in every addressing mode without crossing page boundaries."""
+    cpu.memory.write_bytes(0, operand)
+    cpu.memory.write(ZERO_PAGE_POINTER_LOCATION, INDIRECT_DATA_LOCATION & 0xff)
+    cpu.memory.write(ZERO_PAGE_POINTER_LOCATION + 1, (INDIRECT_DATA_LOCATION >> 8) & 0xff)
+    if value_location is not None:
+        cpu.memory.write(value_location, TEST_VALUE)
+    cpu.x = INDEX
+    cpu.y = INDEX
+    cpu.lda(mode)
+
+    assert cpu.a == TEST_VALUE
+    assert cpu.pc == len(operand)
+    assert cpu.cycles == cycles
+    assert cpu.status & (1 << CPU6502.STATUS_N) > 0
+    assert cpu.status & (1 << CPU6502.STATUS_Z) == 0
 
 
 def test_lda_absolute_x(cpu: CPU6502):  # noqa: D103
@@ -1,6 +1,9 @@
 """Test control instructions, i.e., BRK, and NOP."""
 
-from another6502.cpu import CPU6502
+import pytest
+
+from another6502.codegen import compile_block
+from another6502.cpu import CPU6502, StepResult
 from another6502.memory import MemoryBlock
 
 
@@ -20,6 +23,18 @@ def test_brk():  # noqa: D103
     assert cpu.cycles == 7  # noqa: PLR2004
 
 
+def test_unhandled_opcode(caplog: pytest.LogCaptureFixture):
+    """Test if opcodes without an implementation are reported and treated like BRK."""
+    cpu = CPU6502(MemoryBlock(0x10000))
+    cpu.memory.write_bytes_hex(0x0200, "02")  # illegal opcode
+    cpu.pc = 0x0200
+
+    assert cpu.step() == StepResult.BRK
+    assert "Unhandled opcode at $0200" in caplog.text
+    assert cpu.pull_byte_from_stack() & (1 << CPU6502.STATUS_B) > 0
+    assert cpu.cycles == 7  # noqa: PLR2004
+
+
 def test_jmp_absolute(cpu: CPU6502):  # noqa: D103
     cpu.memory.write_bytes_hex(0, "00 04")
     cpu.jmp(mode="absolute")
@@ -77,6 +92,27 @@ def test_rti(cpu: CPU6502):  # noqa: D103
     assert cpu.cycles == rti_cycle_count
 
 
+@pytest.mark.parametrize("execution", ["method", "handler", "block"])
+def test_rti_from_brk(cpu: CPU6502, execution: str):
+    """Test if returning with a status pushed by BRK is not mistaken for another BRK and leaves B cleared."""
+    cpu.memory.write_bytes_hex(0, "40")  # RTI
+    cpu.push_byte_to_stack(0x02)
+    cpu.push_byte_to_stack(0x00)
+    cpu.push_byte_to_stack((1 << CPU6502.STATUS_I) | (1 << CPU6502.STATUS_B))
+    if execution == "method":
+        cpu.pc = 1
+        cpu.rti()
+    elif execution == "handler":
+        assert cpu.step() == StepResult.NORMAL
+    else:
+        block = compile_block(cpu.memory.read, cpu.memory.write, 0)
+        assert block is not None
+        block.function(cpu)
+    assert cpu.pc == 0x0200  # noqa: PLR2004
+    assert not cpu.status & (1 << CPU6502.STATUS_B)
+    assert cpu.status & (1 << CPU6502.STATUS_I)
+
+
 def test_rts(cpu: CPU6502):  # noqa: D103
     rts_cycle_count = 6
     subroutine_address = 0x0208
@@ -22,8 +22,34 @@ def test_out_of_bounds_access(memory: MemoryBlock, caplog: pytest.LogCaptureFixt
     memory.read(len(memory.mem))
     assert "out of memory range" in caplog.text
 
+
+def test_out_of_bounds_write(memory: MemoryBlock, caplog: pytest.LogCaptureFixture):
+    """Test if writes outside of the memory are reported and do not wrap around to its end."""
+    memory.write(-1, 0xab)
+    memory.write(len(memory.mem), 0xab)
+    assert caplog.text.count("out of memory range") == 2  # noqa: PLR2004
+    assert memory.mem[-1] == 0
+
 def test_memory_size():
     """Test if we can read the size of a memory block with the `len` function."""
     mem_size = 1024
     memory = MemoryBlock(mem_size)
     assert len(memory) == mem_size
+
+
+def test_write_bytes_out_of_bounds(memory: MemoryBlock):
+    """Test if writing a sequence beyond the end of memory raises an error and does not resize the memory."""
+    with pytest.raises(IndexError):
+        memory.write_bytes(len(memory) - 1, bytes([0xab, 0xcd]))
+    assert len(memory) == 1024  # noqa: PLR2004
+
+
+def test_page_buffer(memory: MemoryBlock):
+    """Test if page buffers are views of the memory."""
+    buffer = memory.page_buffer(1)
+    assert buffer is not None
+    buffer[0x10] = 0xab
+    memory.write(0x0111, 0xcd)
+    assert memory.read(0x0110) == 0xab  # noqa: PLR2004
+    assert buffer[0x11] == 0xcd  # noqa: PLR2004
+    assert memory.page_buffer(len(memory) // 0x100) is None
@@ -1,5 +1,7 @@
 """Tests for Memory Maps."""
 
+import pytest
+
 from another6502.memory import MemoryBlock, MemoryMap
 
 TEST_VALUE = 0xfe
@@ -26,3 +28,63 @@ def test_read():  # noqa: D103
     )
     assert memory.read(0x0100) == TEST_VALUE
     assert memory.read(0x01ff) == TEST_VALUE
+
+
+def test_unaligned_regions():
+    """Test reading and writing regions that do not start or end at page boundaries."""
+    low = MemoryBlock(0x0180)
+    high = MemoryBlock(0x0100)
+    memory = (
+        MemoryMap()
+        .add_block(0x0000, low)
+        .add_block(0x0180, high)
+    )
+    memory.write(0x017f, TEST_VALUE)
+    memory.write(0x0180, TEST_VALUE - 1)
+    memory.write(0x027f, TEST_VALUE - 2)
+
+    assert low.read(0x017f) == TEST_VALUE
+    assert high.read(0x0000) == TEST_VALUE - 1
+    assert high.read(0x00ff) == TEST_VALUE - 2
+    assert memory.read(0x017f) == TEST_VALUE
+    assert memory.read(0x0180) == TEST_VALUE - 1
+    assert memory.read(0x027f) == TEST_VALUE - 2
+
+
+def test_unmapped_address(caplog: pytest.LogCaptureFixture):
+    """Test if accessing addresses outside of all regions logs a warning."""
+    memory = MemoryMap().add_block(0x0100, MemoryBlock(0x0100))
+
+    memory.write(0x0000, TEST_VALUE)
+    assert memory.read(0x0000) == 0
+    assert memory.read(0x10000) == 0
+    assert "0x0000" in caplog.text
+    assert "0x10000" in caplog.text
+
+
+def test_negative_address(caplog: pytest.LogCaptureFixture):
+    """Test if negative addresses are reported instead of wrapping around to the end of the map."""
+    memory = MemoryMap().add_block(0x0000, MemoryBlock(0x10000))
+    memory.write(0xffff, TEST_VALUE)
+
+    memory.write(-2, TEST_VALUE)
+    assert memory.read(-1) == 0
+    assert memory.read(0xfffe) == 0
+    assert caplog.text.count("not part of memory map") == 2  # noqa: PLR2004
+
+
+def test_page_buffers():
+    """Test if the map provides the page buffers of page aligned regions only."""
+    ram = MemoryBlock(0x0200)
+    memory = (
+        MemoryMap()
+        .add_block(0x0000, ram)
+        .add_block(0x0280, MemoryBlock(0x0100))
+    )
+    buffer = memory.page_buffer(1)
+    assert buffer is not None
+    buffer[0] = TEST_VALUE
+    assert ram.read(0x0100) == TEST_VALUE
+    assert memory.read(0x0100) == TEST_VALUE
+    assert memory.page_buffer(2) is None
+    assert memory.page_buffer(3) is None
@@ -0,0 +1,28 @@
+"""Test the terminal peripheral."""
+
+import pytest
+
+from another6502.peripherals import TerminalPeripheral
+
+
+def test_output_buffering(capsys: pytest.CaptureFixture[str]):
+    """Test if output is printed at the end of a line or when flushed."""
+    terminal = TerminalPeripheral()
+    for ch in b"Hi":
+        terminal.mmio_block.write(1, ch)
+    assert capsys.readouterr().out == ""
+
+    terminal.mmio_block.write(1, ord("\r"))
+    assert capsys.readouterr().out == "Hi\r\n"
+
+    terminal.mmio_block.write(1, 0xff)
+    terminal.flush()
+    assert capsys.readouterr().out == "?"
+
+
+def test_full_output_buffer(capsys: pytest.CaptureFixture[str]):
+    """Test if output is printed when the buffer is full."""
+    terminal = TerminalPeripheral()
+    for _ in range(TerminalPeripheral.OUTPUT_BUFFER_SIZE):
+        terminal.mmio_block.write(1, ord("a"))
+    assert capsys.readouterr().out == "a" * TerminalPeripheral.OUTPUT_BUFFER_SIZE